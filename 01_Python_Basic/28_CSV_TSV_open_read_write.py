@@ -138,10 +138,10 @@ with open(file=f"{parent_dir}/medals.csv", mode="r", newline="", encoding="utf-8
 
 import csv
 
-def process_csv_chunks(file_path, chunk_size=1000):
+def process_csv_chunks(file_path, chunk_size=1000, delimiter="\t"):
     """Generator function to process CSV file in chunks."""
     with open(file=file_path, mode="r", newline="", encoding="utf-8") as file_pointer:
-        reader = csv.DictReader(file_pointer, delimiter="\t")
+        reader = csv.DictReader(file_pointer, delimiter=delimiter)
         chunk = []
         for row in reader:
             chunk.append(row)
@@ -163,6 +163,193 @@ for chunk in process_csv_chunks(f"{parent_dir}/weather.tsv", chunk_size=chunk_si
         print(row)  # Or whatever processing you need
 
 
+###################################################################
+## (ADVANCED) Process a huge .csv or .tsv file in parallel chunks ##
+###################################################################
+
+# process_csv_chunks() above reads the whole file in one process, and every row is a dictionary (the keys are repeated in every row).
+# process_csv_parallel() below:
+# ++ splits the file into chunks of about chunk_size bytes, always between two records (never inside a quoted value, even one with a line break)
+# ++ sends only (start, end) byte offsets to a pool of processes, each process reads and parses its own chunk
+# ++ converts the values once with the column types inferred from the first rows: every row is a tuple like (1924, 'Chamonix', ...)
+# ++ runs your callback on every chunk inside the worker processes, and keeps at most max_in_flight chunks in memory
+
+import io
+import os
+import multiprocessing
+from collections import deque
+from itertools import islice, chain
+
+def _record_boundaries(file_path, start, chunk_size, quotechar='"'):
+    """Yield the (start, end) byte offsets of the chunks, every end is right after a line break outside the quotes."""
+    quote = quotechar.encode()
+
+    with open(file_path, "rb") as file_pointer:
+        file_pointer.seek(start)
+        chunk_start, position, inside_quotes = start, start, False
+
+        while block := file_pointer.read(chunk_size):
+            cut = block.rfind(b"\n")
+            while cut != -1 and inside_quotes != (block.count(quote, 0, cut) % 2 == 1): # An odd number of quotes before: inside a value
+                cut = block.rfind(b"\n", 0, cut)
+
+            if cut != -1:
+                yield chunk_start, position + cut + 1
+                chunk_start = position + cut + 1
+
+            inside_quotes = inside_quotes != (block.count(quote) % 2 == 1)
+            position += len(block)
+
+        if chunk_start < position:
+            yield chunk_start, position
+
+
+_type_order = ("int", "float", "str")  # From the narrowest to the widest type, any value fits "str"
+_converters = {"int": int, "float": float, "str": str}
+
+def _widen_column_types(column_types, row, missing_values):
+    """Return the column types widened (int => float => str) just enough for every value of the row to fit."""
+    widened = list(column_types)
+    for position, value in enumerate(row[:len(widened)]):
+        if value in missing_values:
+            continue
+
+        for type_name in _type_order[_type_order.index(widened[position]):]:
+            try:
+                _converters[type_name](value)
+            except ValueError:
+                continue
+
+            widened[position] = type_name
+            break
+
+    return widened
+
+
+def _infer_column_types(sample_rows, column_count, missing_values):
+    """Return "int", "float" or "str" for every column, from a sample of rows (a column without any value is "str")."""
+    column_types = ["int"] * column_count
+    for row in sample_rows:
+        column_types = _widen_column_types(column_types, row, missing_values)
+
+    has_values = [any(position < len(row) and row[position] not in missing_values for row in sample_rows) for position in range(column_count)]
+    return [column_type if has_value else "str" for column_type, has_value in zip(column_types, has_values)]
+
+
+def _parse_csv_chunk(file_path, start, end, dialect, columns, column_types, missing_values, encoding, callback):
+    """
+    Worker: read and parse the bytes [start, end) of the file, then run the callback on the typed rows.
+    Return (the rows or the callback result, the column types used), they are wider than the given ones if a value did not fit.
+    """
+    with open(file_path, "rb") as file_pointer:
+        file_pointer.seek(start)
+        text = file_pointer.read(end - start).decode(encoding)
+
+    column_types = list(column_types)
+    while True:
+        converters = [_converters[column_type] for column_type in column_types]
+        rows = []
+        for row in csv.reader(io.StringIO(text, newline=""), **dialect):
+            if not row:  # Blank line
+                continue
+
+            try:
+                rows.append(tuple(
+                    None if value in missing_values else convert(value)
+                    for convert, value in zip(converters, row)
+                ))
+            except ValueError:  # e.g. "2.5" in an "int" column: widen the column, then parse the chunk again (the text is still in memory)
+                column_types = _widen_column_types(column_types, row, missing_values)
+                break
+        else:
+            break
+
+    return (callback(columns, rows) if callback is not None else rows), column_types
+
+
+def process_csv_parallel(file_path, callback=None, delimiter=None, chunk_size=4 * 1024 * 1024, processes=None, max_in_flight=None,
+                         missing_values=("", "NA"), sample_size=1000, encoding="utf-8"):
+    """
+    Generator function to process a huge CSV file in parallel chunks, in the order of the file.
+
+    callback: a function callback(columns, rows) run in the worker processes (defined at the top level of a module, so it can be sent to them),
+              its return value is yielded for every chunk. Without callback, the rows of every chunk are yielded
+    delimiter: "," ";" "|" "\t"... (default: guessed from the header row with csv.Sniffer)
+    chunk_size: the approximate number of bytes of a chunk
+    processes: the number of worker processes (default: all CPU cores)
+    max_in_flight: the maximum number of chunks being parsed or waiting to be consumed (default: 2 * processes)
+    missing_values: the values converted to None
+    sample_size: the number of rows used to infer the column types ("int", "float" or "str")
+
+    A column with a value which does not fit its inferred type is widened (int => float => str) in this chunk and in the next chunks,
+    the chunks already yielded keep the narrower type (e.g. 7 instead of 7.0).
+    """
+    processes = processes or os.cpu_count()
+    max_in_flight = max_in_flight or 2 * processes
+    missing_values = frozenset(missing_values)
+
+    with open(file_path, "rb") as file_pointer:
+        header = file_pointer.readline()
+        while header.count(b'"') % 2 == 1:  # A quoted column name with a line break
+            header += file_pointer.readline()
+        data_start = file_pointer.tell()
+
+        header_text = header.decode(encoding)
+        if delimiter is None:
+            try:
+                delimiter = csv.Sniffer().sniff(header_text, delimiters=",\t;|").delimiter
+            except csv.Error:  # e.g. a single column
+                delimiter = ","
+
+        dialect = {"delimiter": delimiter}
+        columns = next(csv.reader(io.StringIO(header_text, newline=""), **dialect))
+        sample_rows = list(islice(csv.reader(io.TextIOWrapper(file_pointer, encoding=encoding, newline=""), **dialect), sample_size))
+
+    column_types = _infer_column_types(sample_rows, len(columns), missing_values)
+    tasks = (  # column_types is read when each task is created: a widened column is sent as widened to the next chunks
+        (file_path, start, end, dialect, columns, column_types, missing_values, encoding, callback)
+        for start, end in _record_boundaries(file_path, data_start, chunk_size)
+    )
+
+    first_tasks = list(islice(tasks, 2))
+    if len(first_tasks) <= 1:  # A small file is faster without starting the worker processes
+        for task in first_tasks:
+            yield _parse_csv_chunk(*task)[0]
+        return
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        pending = deque()
+        for task in chain(first_tasks, tasks):
+            pending.append(pool.apply_async(_parse_csv_chunk, task))
+            if len(pending) >= max_in_flight:  # Wait for the oldest chunk before reading more of the file
+                result, chunk_types = pending.popleft().get()
+                column_types = [max(types, key=_type_order.index) for types in zip(column_types, chunk_types)]
+                yield result
+
+        while pending:
+            yield pending.popleft().get()[0]
+
+
+# Usage example: count the gold medals of every country
+# (on Windows / macOS, the worker processes re-run this script: keep such calls under if __name__ == "__main__":)
+
+from collections import Counter
+
+def count_gold_medals(columns, rows):
+    noc, medal = columns.index("NOC"), columns.index("Medal")
+    return Counter(row[noc] for row in rows if row[medal] == "Gold")
+
+gold_medals = Counter()
+for chunk_counts in process_csv_parallel(f"{parent_dir}/medals.csv", callback=count_gold_medals, chunk_size=64 * 1024):
+    gold_medals.update(chunk_counts)
+
+print(gold_medals.most_common(3))  # [('NOR', 98), ('USA', 78), ('URS', 78)]
+
+for rows in process_csv_parallel(f"{parent_dir}/weather.tsv"):  # The tab delimiter is guessed from the header row
+    print(rows[0])  # (8.0, 24.3, 0.0, 3.4, 6.3, 'NW', 30, 'SW', 'NW', 6, 20, 68, 29, 1019.7, 1015.0, 7, 7, 14.4, 23.6, 'No', 3.6, 'Yes')
+    break
+
+
 #--------------------------------------------------------------------------------#
 #----------------------- Write .csv and .tsv files ------------------------------#
 #--------------------------------------------------------------------------------#
@@ -130,3 +130,22 @@ item3 = ItemWithRepr("Tablet", 800, 2)
 print(ItemWithRepr.all_items) # Print out the list of all the items created
 # [Item(Laptop, 1500, 3), Item(Phone, 1000, 5), Item(Tablet, 800, 2)]
 # The output now looks really more friendly and informative.
+
+
+######## Keep track of the items without keeping them alive ########
+
+# The all_items list above keeps every created item alive forever (even the deleted ones),
+# and finding an item by name means scanning the whole list.
+# The Item class of item.py uses an ItemRegistry instead: weak references, indexed by name and by type
+
+from item import Item
+
+item1 = Item("Laptop", 1500, 3)
+item2 = Item("Phone", 1000, 5)
+item3 = Item("Tablet", 800, 2)
+
+print(Item.all_items)                  # [Item(Laptop, 1500, 3), Item(Phone, 1000, 5), Item(Tablet, 800, 2)]
+print(Item.all_items.by_name("Phone")) # [Item(Phone, 1000, 5)] (a dictionary lookup, not a scan)
+
+del item3                              # Nothing else refers to this item, so it is garbage-collected
+print(Item.all_items)                  # [Item(Laptop, 1500, 3), Item(Phone, 1000, 5)]
@@ -9,8 +9,20 @@
 #              and IS involved in creating new instances of the class (like construct_from_csv() below)
 
 import csv
+import io
+import os
+import multiprocessing
+from itertools import islice
 
 class Employee:
+    type_converters = {"int": int, "float": float, "str": str} # Class attribute, in widening order: every text is at least a str
+
+    def __init__(self, **attributes): # e.g. Employee(name="Alice", age=30, city="New York")
+        self.__dict__.update(attributes)
+
+    def __repr__(self):
+        return f"Employee({', '.join(f'{key}={value!r}' for key, value in self.__dict__.items())})"
+
     @classmethod # indicates the below method is a class method, not an instance method
     def demo_class_method(cls): # class method requires "cls" as the first argument, like "self" for instance method
         print("This is a demo class method of the class Item")
@@ -23,6 +35,106 @@ class Employee:
 
         return employees
 
+    @staticmethod
+    def infer_column_types(columns, sample_lines):
+        # Infer the type of every column ("int", "float" or "str") once, from a sample of lines (bytes) of the file
+        sample_rows = [row for row in csv.reader(line.decode() for line in sample_lines) if row]
+        column_types = {}
+
+        for position, column in enumerate(columns):
+            values = [row[position] if position < len(row) else "" for row in sample_rows]
+            column_types[column] = Employee.convert_column(values, "int")[1] if any(values) else "str" # The narrowest type fitting the sample
+
+        return column_types
+
+    @staticmethod
+    def convert_column(values, column_type):
+        # Return (converted values, type used): column_type if every text of the column fits it, else the first wider type that fits
+        type_names = list(Employee.type_converters)
+
+        for type_name in type_names[type_names.index(column_type):]:
+            try:
+                return [Employee.type_converters[type_name](value) if value != "" else None for value in values], type_name
+
+            except ValueError: # int("2.5"), float("N/A")...: try the next type
+                pass
+
+    @classmethod
+    def construct_from_csv_bulk(cls, file_path: str, processes: int = None, chunk_size: int = 64 * 1024 * 1024, as_table: bool = False):
+        '''
+        Construct the employees of a big .csv file in parallel:
+        ++ the column types are inferred once, from the first 1000 rows (e.g. Age => int)
+        ++ the file is split into byte ranges of chunk_size bytes, each one is parsed and converted by a process of the pool
+        ++ a column whose later values do not fit the inferred type is widened (int => float => str) in the whole table,
+           e.g. an "id" column of integers in the sample but with "A-17" at the end of the file becomes a column of strings
+
+        processes: the number of worker processes (default: all CPU cores)
+        chunk_size: the number of bytes parsed by a worker at once
+        as_table: False returns a list of Employee objects, True returns the table {column: list of values} (much lighter)
+
+        A quoted value containing a line break is not supported (a byte range always starts at the beginning of a line),
+        use construct_from_csv() for such files.
+        '''
+        with open(file_path, "rb") as f:
+            header_line = f.readline()
+            data_start = f.tell()
+            sample_lines = list(islice(f, 1000))
+
+        header = next(csv.reader([header_line.decode()]), None)
+        if not header: # An empty file
+            return {} if as_table else []
+
+        columns = [column.strip().lower().replace(" ", "_") for column in header] # "Name" => employee.name
+        column_types = Employee.infer_column_types(columns, sample_lines)
+
+        file_size = os.path.getsize(file_path)
+        tasks = [(file_path, start, min(start + chunk_size, file_size), column_types) for start in range(data_start, file_size, chunk_size)]
+
+        if len(tasks) <= 1: # One byte range only: parsing it right here is cheaper than creating a pool for it
+            chunks = [_parse_byte_range(*task) for task in tasks]
+
+        else:
+            with multiprocessing.Pool(processes=processes) as pool:
+                chunks = pool.starmap(_parse_byte_range, tasks) # In the order of the file
+
+                # A worker may have widened some columns of its byte range: every range must end up with the widest type of each column
+                column_types = {column: max((chunk_types[column] for _, chunk_types in chunks), key=list(Employee.type_converters).index) for column in columns}
+                narrower = [index for index, (_, chunk_types) in enumerate(chunks) if chunk_types != column_types]
+
+                if narrower: # Rare, only these byte ranges are parsed again
+                    reparsed = pool.starmap(_parse_byte_range, [(*tasks[index][:3], column_types) for index in narrower])
+                    for index, chunk in zip(narrower, reparsed):
+                        chunks[index] = chunk
+
+        table = {column: [value for chunk_table, _ in chunks for value in chunk_table[column]] for column in columns}
+
+        if as_table:
+            return table
+
+        return [cls(**dict(zip(columns, row))) for row in zip(*table.values())]
+
+
+def _parse_byte_range(file_path, start, end, column_types):
+    # Worker of construct_from_csv_bulk(): parse the lines starting in the bytes [start, end) of the file
+    # Return ({column: values}, {column: type}), the types can be wider than the given ones
+    with open(file_path, "rb") as f:
+        f.seek(start - 1)
+        f.readline() # The line running over start belongs to the previous byte range
+        position = f.tell()
+
+        data = f.read(max(0, end - position))
+        if data and not data.endswith(b"\n"):
+            data += f.readline() # Complete the last line, it starts before end
+
+    rows = [row for row in csv.reader(io.StringIO(data.decode())) if row] # Without the blank lines
+    table, range_types = {}, {}
+
+    for position, (column, column_type) in enumerate(column_types.items()):
+        values = [row[position] if position < len(row) else "" for row in rows] # Converted column by column, the raw texts are kept for a retry
+        table[column], range_types[column] = Employee.convert_column(values, column_type)
+
+    return table, range_types
+
 print(Employee.demo_class_method()) # Execute a class method
                                     # This is a demo class method of the class Item
                                     # None (this is because we did not define the return value for the demo method)
@@ -35,4 +147,15 @@ print(lst_employees)
 # {'Name': 'Bob', 'Age': '25', 'City': 'Los Angeles'}
 # {'Name': 'Charlie', 'Age': '35', 'City': 'Chicago'}
 
+# For big files (several GB), construct_from_csv_bulk() infers the column types once and parses the file in parallel
+# Where processes are started with "spawn" (Windows, macOS), each worker imports this file again before running _parse_byte_range(),
+# so a real script must call construct_from_csv_bulk() inside an if __name__ == "__main__": block
+
+employees = Employee.construct_from_csv_bulk(file_path=csv_path)
+print(employees)
+# [Employee(name='Alice', age=30, city='New York'), Employee(name='Bob', age=25, city='Los Angeles'), Employee(name='Charlie', age=35, city='Chicago')]
+
+print(Employee.construct_from_csv_bulk(file_path=csv_path, as_table=True))
+# {'name': ['Alice', 'Bob', 'Charlie'], 'age': [30, 25, 35], 'city': ['New York', 'Los Angeles', 'Chicago']}
+
 ### NOT RECOMMEND: class methods can be called from an instance, but should not do so
@@ -1,8 +1,10 @@
 # Create Item class
 
+from item import ItemRegistry # Keeps weak references of the items, indexed by name and type (see item.py)
+
 class Item:
 
-    all_items = []
+    all_items = ItemRegistry()
 
     def __init__(self, name: str, price: float, quantity: int):
         assert isinstance(name, str), "Name must be a string"
@@ -13,7 +15,7 @@ class Item:
         self.price = price        
         self.quantity = quantity
 
-        Item.all_items.append(self)
+        Item.all_items.add(self)
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name}, {self.price}, {self.quantity})"
@@ -58,6 +60,10 @@ print(phone1.calculate_total_price())  # Output: 6000 (1200 * 5)
 print(Phone.all_items) # Output: [Phone(iPhone 14, 1200, 5), Phone(Samsung Galaxy S23, 1000, 3)]
                        # It also inherits the all_items attribute and the __repr__() method from Item
 
+print(Item.all_items.of_type(Phone))         # Output: [Phone(iPhone 14, 1200, 5), Phone(Samsung Galaxy S23, 1000, 3)]
+print(Item.all_items.by_name("iPhone 14"))   # Output: [Phone(iPhone 14, 1200, 5)]
+                                             # Both lookups use an index, they do not scan all the items
+
 
 #----------------------------------------------------------#
 #----------- Inheritance from other .py file --------------#
@@ -86,4 +92,8 @@ print(fruit1.is_organic)  # Output: True
 print(fruit1.calculate_total_price())  # Output: 25.0 (2.5 * 10)
 
 print(Fruit.all_items)  # Output: [Fruit(Apple, 2.5, 10), Fruit(Banana, 1.5, 20)]
-                        # It inherits the all_items attribute and the __repr__() method from Item
\ No newline at end of file
+                        # It inherits the all_items attribute and the __repr__() method from Item
+
+del fruit2                    # all_items only keeps weak references, the deleted item is removed from it
+print(Fruit.all_items)        # Output: [Fruit(Apple, 2.5, 10)]
+print(Fruit.all_items.of_type(Fruit))  # Output: [Fruit(Apple, 2.5, 10)]
\ No newline at end of file
@@ -148,6 +148,104 @@ print(rectangle.area())   # Output: 35
 # Users interact with the shapes through the common interface defined by the abstract class
 
 
+############# Many shapes at once: ShapeBatch #############
+
+'''
+Calling shape.area() on a list of millions of Shape objects costs one Python method call (virtual dispatch) per shape.
+ShapeBatch keeps the same common interface, but stores the shapes grouped by type in contiguous NumPy arrays
+(all radiuses together, all lengths together, all widths together...).
+Then each type is computed by one vectorized kernel, and the results are scattered back in the original order.
+'''
+
+import numpy as np
+
+class ShapeBatch:
+    # One entry per shape type: the attributes to store, and the vectorized area / perimeter of these attributes
+    kernels = {
+        Circle: {
+            "fields": ("radius",),
+            "area": lambda radius: 3.14159 * radius ** 2,
+            "perimeter": lambda radius: 2 * 3.14159 * radius
+        },
+        Rectangle: {
+            "fields": ("length", "width"),
+            "area": lambda length, width: length * width,
+            "perimeter": lambda length, width: 2 * (length + width)
+        }
+    }
+
+    def __init__(self, shapes):
+        self.shapes = list(shapes)  # Keep the objects, iterating a ShapeBatch is the same as iterating the list
+        self.groups = {}            # {shape type: (positions in the original order, {field: array})}
+
+        positions_by_type = {}
+        for position, shape in enumerate(self.shapes):
+            positions_by_type.setdefault(type(shape), []).append(position)
+
+        for shape_type, positions in positions_by_type.items():
+            fields = ShapeBatch.kernels.get(shape_type, {}).get("fields", ())
+            columns = {
+                field: np.fromiter((getattr(self.shapes[position], field) for position in positions), dtype=np.float64, count=len(positions))
+                for field in fields
+            }
+            self.groups[shape_type] = (np.array(positions, dtype=np.intp), columns)
+
+    @classmethod
+    def register(cls, shape_type, fields, area, perimeter=None):
+        # Add the vectorized kernel of another Shape subclass (e.g. Square, Triangle...)
+        cls.kernels[shape_type] = {"fields": tuple(fields), "area": area, "perimeter": perimeter}
+
+    def __compute(self, method_name):
+        results = np.empty(len(self.shapes), dtype=np.float64)
+
+        for shape_type, (positions, columns) in self.groups.items():
+            kernel = ShapeBatch.kernels.get(shape_type, {}).get(method_name)
+
+            if kernel is not None:
+                results[positions] = kernel(*columns.values())  # One call for all the shapes of this type
+
+            elif callable(getattr(shape_type, method_name, None)):  # Unknown type (no kernel): fall back to one method call per shape
+                results[positions] = [getattr(self.shapes[position], method_name)() for position in positions]
+
+            else:  # e.g. a shape registered without a perimeter kernel, and without a perimeter() method
+                raise TypeError(f"{shape_type.__name__} has no {method_name}() method and no registered {method_name} kernel")
+
+        return results
+
+    def area(self):
+        return self.__compute("area")
+
+    def perimeter(self):
+        return self.__compute("perimeter")
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __iter__(self):
+        return iter(self.shapes)
+
+    def __getitem__(self, index):
+        return self.shapes[index]
+
+    def __repr__(self):
+        counts = ", ".join(f"{len(positions)} {shape_type.__name__}" for shape_type, (positions, _) in self.groups.items())
+        return f"ShapeBatch({counts})"
+
+shapes = ShapeBatch([Circle(6), Rectangle(5, 7), Circle(1), Rectangle(2, 3)])
+
+print(shapes)               # Output: ShapeBatch(2 Circle, 2 Rectangle)
+print(shapes.area())        # Output: [113.09724  35.        3.14159   6.     ]
+print(shapes.perimeter())   # Output: [37.69908 24.       6.28318 10.     ]
+
+for shape in shapes:        # Still the Shape objects, in the original order
+    print(shape.area())     # Output: 113.09724, 35, 3.14159, 6
+
+# In this example, the 2 circles are computed by one call of the Circle kernel and the 2 rectangles by one call of the Rectangle kernel,
+# instead of 4 calls of .area(). The more shapes in the batch, the bigger the difference.
+# A Shape subclass without a registered kernel still works, its own .area() is called for each of its objects
+# (a TypeError naming the class is raised if it has neither a kernel nor the method, e.g. .perimeter() of a Shape which only defines .area())
+
+
 #-----------------------------------------------------#
 #---------------- Inheritance ------------------------#
 #-----------------------------------------------------#
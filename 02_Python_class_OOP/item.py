@@ -1,33 +1,346 @@
 # Create the Item class in a separate file named item.py
 
 import csv
+import weakref
+from itertools import count, islice
+import numpy as np
+
+class ItemRegistry:
+    '''
+    Keep track of all the created items, like a class-level list, but:
+    ++ only weak references are stored, so an item that is not used anywhere else can be garbage-collected
+       (a list keeps every item alive forever, the memory of a long-running program keeps growing)
+    ++ the items are indexed by name and by type (Item, Phone, Fruit...), a lookup does not scan all the items
+    '''
+
+    def __init__(self):
+        self._items = {}      # {key: weak reference of the item}, in creation order
+        self._by_name = {}    # {name: {key: weak reference}}
+        self._by_type = {}    # {class: {key: weak reference}}
+        self._keys = count()
+
+    def add(self, item):
+        key, name, item_type = next(self._keys), item.name, type(item) # Indexed by the name given at creation
+        reference = weakref.ref(item, lambda _: self._discard(key, name, item_type)) # Called when the item is garbage-collected
+
+        self._items[key] = reference
+        self._by_name.setdefault(name, {})[key] = reference
+        self._by_type.setdefault(item_type, {})[key] = reference
+
+    append = add # Same call as the old all_items list
+
+    def _discard(self, key, name, item_type):
+        self._items.pop(key, None)
+
+        name_bucket = self._by_name[name]
+        del name_bucket[key]
+        if not name_bucket:
+            del self._by_name[name] # No empty bucket is left behind
+
+        type_bucket = self._by_type[item_type]
+        del type_bucket[key]
+        if not type_bucket:
+            del self._by_type[item_type]
+
+    @staticmethod
+    def _alive(references):
+        return [item for reference in list(references) if (item := reference()) is not None]
+
+    def by_name(self, name):
+        # All the alive items with this name
+        return ItemRegistry._alive(self._by_name.get(name, {}).values())
+
+    def of_type(self, item_type):
+        # All the alive items of this class and its subclasses (e.g. of_type(Item) also returns the phones)
+        return [
+            item
+            for indexed_type, bucket in list(self._by_type.items()) if issubclass(indexed_type, item_type)
+            for item in ItemRegistry._alive(bucket.values())
+        ]
+
+    def __iter__(self):
+        return iter(ItemRegistry._alive(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __repr__(self):
+        return repr(list(self)) # Printed like the old all_items list
+
 
 class Item:
 
-    all_items = []
+    all_items = ItemRegistry() # Shared by Item and all its subclasses
 
     def __init__(self, name: str, price: float, quantity: int):
         assert isinstance(name, str), "Name must be a string"
         assert price >= 0, "Price must be greater than zero"
         assert quantity >= 0, "Quantity must be greater than or equal to zero"
 
-        self.name = name          
-        self.price = price        
+        self.name = name
+        self.price = price
         self.quantity = quantity
 
-        Item.all_items.append(self)
+        Item.all_items.add(self)
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name}, {self.price}, {self.quantity})"
         # Use self.__class__.name__ to get the class name dynamically
-      
+
     def calculate_total_price(self):
         return self.price * self.quantity
-    
+
     @classmethod
     def construct_from_csv(cls, file_path: str): #A function to construct an instance of the class from a .csv file
         with open(file_path, 'r') as f:
             reader = csv.DictReader(f) # Read .csv file as a dictionary
             items = list(reader)
 
-        return items
\ No newline at end of file
+        return items
+
+    # construct_from_csv() keeps the whole file in memory as dictionaries of strings,
+    # stream_from_csv() below is made for big files (tens of millions of rows)
+
+    @classmethod
+    def stream_from_csv(cls, file_path: str, batch_size: int = 65536, columnar: bool = False, skip_invalid: bool = False):
+        '''
+        Read a .csv file with the columns name, price and quantity, batch_size rows at a time (constant memory).
+        The price and quantity of a whole batch are converted and validated at once with NumPy, instead of one assert per item.
+
+        file_path: the path to the .csv file
+        batch_size: the number of rows read, converted and validated at once
+        columnar: False yields the items one by one, True yields one {"name": list, "price": array, "quantity": array} per batch
+        skip_invalid: False raises a ValueError on the first batch having invalid rows, True drops the invalid rows
+
+        return: a generator, nothing is read before the first item (or batch) is requested
+        '''
+        with open(file_path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None: # Empty file
+                return
+
+            try:
+                columns = [header.index(column) for column in ("name", "price", "quantity")]
+
+            except ValueError:
+                raise ValueError(f"{file_path} must have the columns name, price and quantity, got {header}") from None
+
+            first_row = 2 # The header is row 1
+            while rows := list(islice(reader, batch_size)):
+                names, prices, quantities, valid = Item.__convert_batch(rows, columns)
+
+                if not valid.all():
+                    if not skip_invalid:
+                        invalid_rows = (first_row + np.flatnonzero(~valid)).tolist()
+                        raise ValueError(
+                            f"Invalid rows in {file_path}: {invalid_rows[:10]}{' ...' if len(invalid_rows) > 10 else ''} "
+                            "(price must be a finite number >= 0, quantity an integer >= 0)"
+                        )
+
+                    names = [name for name, is_valid in zip(names, valid.tolist()) if is_valid]
+                    prices, quantities = prices[valid], quantities[valid]
+
+                first_row += len(rows)
+
+                if columnar:
+                    yield {"name": names, "price": prices, "quantity": quantities}
+
+                else:
+                    for name, price, quantity in zip(names, prices.tolist(), quantities.tolist()):
+                        yield cls._from_valid(name, price, quantity)
+
+    @staticmethod
+    def __convert_batch(rows, columns): # Internal use only
+        name_index, price_index, quantity_index = columns
+        width = max(columns) + 1
+        rows = [row if len(row) >= width else row + [""] * (width - len(row)) for row in rows] # Missing cells are invalid values
+
+        names = [row[name_index] for row in rows]
+        prices = Item.__to_numbers([row[price_index] for row in rows], np.float64, np.nan)
+        quantities = Item.__to_numbers([row[quantity_index] for row in rows], np.int64, -1)
+        valid = np.isfinite(prices) & (prices >= 0) & (quantities >= 0) # NaN and -1 mark the values which are not numbers, inf a price too large (e.g. 1e400)
+
+        return names, prices, quantities, valid
+
+    @staticmethod
+    def __to_numbers(values, dtype, invalid_value): # Internal use only
+        try:
+            return np.array(values, dtype=dtype) # The whole column at once, the usual case
+
+        except (ValueError, OverflowError): # At least one value is not a number (or an integer too large for int64): convert them one by one
+            converted = np.empty(len(values), dtype=dtype)
+            for index, value in enumerate(values):
+                try:
+                    converted[index] = dtype(value)
+
+                except (ValueError, OverflowError):
+                    converted[index] = invalid_value
+
+            return converted
+
+    @classmethod
+    def _from_valid(cls, name, price, quantity):
+        # Create an item from already validated values, without the asserts of __init__()
+        if cls.__init__ is not Item.__init__: # A subclass with its own attributes (e.g. Fruit) must run its __init__()
+            return cls(name, price, quantity)
+
+        item = cls.__new__(cls)
+        item.name, item.price, item.quantity = name, price, quantity
+        Item.all_items.add(item)
+
+        return item
+
+class Inventory:
+    '''
+    Store many items as columns (one NumPy array per attribute) instead of one Python object per item:
+    ++ names, prices, quantities, the class of every item (Item, Phone, Fruit...) and the flags of the subclasses (broken_phone, is_organic...)
+    ++ total prices, discounts and filters are computed on whole columns at once, without a Python loop over the items
+    ++ inventory[i] (or a loop over the inventory) hands out an InventoryItem, a lightweight view of one row
+    '''
+
+    def __init__(self, names, prices, quantities, kinds=None, item_types=(Item,), flags=None):
+        self.names = np.asarray(names, dtype=object)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        raw_quantities = np.asarray(quantities)
+        with np.errstate(invalid="ignore"): # NaN or inf cannot be cast, they are rejected by the assert below
+            self.quantities = raw_quantities.astype(np.int64)
+        self.kinds = np.zeros(len(self.names), dtype=np.int16) if kinds is None else np.asarray(kinds, dtype=np.int16)
+        self.item_types = list(item_types) # kinds[i] is the position of the class of row i in item_types
+        self.flags = {flag: np.asarray(values, dtype=bool) for flag, values in (flags or {}).items()}
+
+        assert len(self.prices) == len(self.names) == len(self.quantities) == len(self.kinds), "All columns must have the same length"
+        assert np.isfinite(self.prices).all(), "Price must be a finite number" # Same rule as Item.stream_from_csv()
+        assert (self.prices >= 0).all(), "Price must be greater than zero"
+        assert (self.quantities == raw_quantities).all(), "Quantity must be an integer" # Instead of silently truncating 2.5 to 2
+        assert (self.quantities >= 0).all(), "Quantity must be greater than or equal to zero"
+
+    @classmethod
+    def from_items(cls, items, flags=("broken_phone", "is_organic")):
+        # Copy existing items (e.g. Item.all_items) into columns, a flag is False for the items without this attribute
+        items = list(items)
+        item_types = list(dict.fromkeys(type(item) for item in items)) or [Item]
+        type_codes = {item_type: code for code, item_type in enumerate(item_types)}
+
+        return cls(
+            names = [item.name for item in items],
+            prices = [item.price for item in items],
+            quantities = [item.quantity for item in items],
+            kinds = [type_codes[type(item)] for item in items],
+            item_types = item_types,
+            flags = {flag: [bool(getattr(item, flag, False)) for item in items] for flag in flags}
+        )
+
+    @classmethod
+    def from_csv(cls, file_path: str, **kwargs):
+        # Load a .csv file (name, price, quantity) without creating any Item, see Item.stream_from_csv() for the kwargs
+        batches = list(Item.stream_from_csv(file_path, columnar=True, **kwargs))
+
+        return cls(
+            names = [name for batch in batches for name in batch["name"]],
+            prices = np.concatenate([batch["price"] for batch in batches]) if batches else [],
+            quantities = np.concatenate([batch["quantity"] for batch in batches]) if batches else []
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return InventoryItem(self, range(len(self))[index]) # Negative indexes are supported, out of range raises IndexError
+
+    def __iter__(self):
+        return (InventoryItem(self, index) for index in range(len(self)))
+
+    def __repr__(self):
+        return f"Inventory({len(self)} items, total price = {self.total_price()})"
+
+    #------------------ Vectorized operations (whole columns at once) ------------------#
+
+    def calculate_total_price(self):
+        # The total price of every item, same as calling item.calculate_total_price() on each of them
+        return self.prices * self.quantities
+
+    def total_price(self):
+        # The total price of the whole inventory
+        return float(self.calculate_total_price().sum())
+
+    def apply_discount(self, discount_rate, where=None):
+        # The discounted prices (the inventory is not changed), where: a boolean mask of the discounted items (default: all items)
+        discounted_prices = self.prices - self.prices * discount_rate
+        return discounted_prices if where is None else np.where(where, discounted_prices, self.prices)
+
+    def reprice(self, discount_rate, where=None):
+        # Apply the discount to the stored prices (in place)
+        self.prices = self.apply_discount(discount_rate, where)
+
+    def is_type(self, item_type):
+        # Boolean mask of the items of this class and its subclasses
+        codes = [code for code, indexed_type in enumerate(self.item_types) if issubclass(indexed_type, item_type)]
+        return np.isin(self.kinds, codes)
+
+    def filter(self, where):
+        # A new Inventory with only the items of the boolean mask, e.g. inventory.filter(inventory.prices > 100)
+        return Inventory(
+            names = self.names[where],
+            prices = self.prices[where],
+            quantities = self.quantities[where],
+            kinds = self.kinds[where],
+            item_types = self.item_types,
+            flags = {flag: values[where] for flag, values in self.flags.items()}
+        )
+
+
+class InventoryItem:
+    '''
+    A view of one row of an Inventory: it reads and writes the columns, nothing is copied.
+    It has the same attributes and methods as an Item, but it is not added to Item.all_items.
+    '''
+    __slots__ = ("_inventory", "_index")
+
+    def __init__(self, inventory, index):
+        self._inventory = inventory
+        self._index = index
+
+    @property
+    def name(self):
+        return self._inventory.names[self._index]
+
+    @property
+    def price(self):
+        return float(self._inventory.prices[self._index])
+
+    @price.setter
+    def price(self, value):
+        assert np.isfinite(value), "Price must be a finite number"
+        assert value >= 0, "Price must be greater than zero"
+        self._inventory.prices[self._index] = value
+
+    @property
+    def quantity(self):
+        return int(self._inventory.quantities[self._index])
+
+    @quantity.setter
+    def quantity(self, value):
+        assert value == int(value), "Quantity must be an integer"
+        assert value >= 0, "Quantity must be greater than or equal to zero"
+        self._inventory.quantities[self._index] = value
+
+    def __getattr__(self, flag): # Only called for the other attributes, e.g. broken_phone or is_organic
+        if flag.startswith("_"): # e.g. _inventory before its slot is set (copy.copy(), pickle), or __deepcopy__
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{flag}'")
+
+        flags = self._inventory.flags
+        if flag not in flags:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{flag}'")
+
+        return bool(flags[flag][self._index])
+
+    def calculate_total_price(self):
+        return self.price * self.quantity
+
+    def __repr__(self):
+        item_type = self._inventory.item_types[self._inventory.kinds[self._index]]
+        return f"{item_type.__name__}({self.name}, {self.price}, {self.quantity})"
@@ -0,0 +1,246 @@
+'''
+Benchmark rectangle_module.py (the CLI, as a subprocess) across input sizes, corruption rates and core counts.
+
+For every dataset and every number of cores, the report contains:
+++ throughput: input files computed per second (wall time of the whole CLI run, including interpreter startup)
+++ latency percentiles: time from the CLI start until each result file is written (p50, p90, p99, max)
+++ peak RSS: the largest resident memory of the CLI process and its pool workers
+++ scaling efficiency: throughput(cores) / (cores * throughput(1 core))
+
+The report also tracks the cold start of the CLI (python -X importtime):
+++ wall time of "rectangle_module.py -l 2 -w 3" (the fast path) and of the full program, median over many runs
+++ total import time, and the slowest imports at the top level of each one
+
+Usage (must be in 02_Python_class_OOP/rectangle_project first):
+    python benchmark_rectangle_module.py --sizes 1000 --max-cores 4 --report bench_report.json
+    python benchmark_rectangle_module.py --sizes 1000 100000 1000000 --corruption-rates 0.1 0.5
+    python benchmark_rectangle_module.py --sizes 100000 --cli-args "--async-io"
+    python benchmark_rectangle_module.py --startup-only --startup-repeats 50
+'''
+
+from loguru import logger
+from pathlib import Path
+from argparse import ArgumentParser, HelpFormatter
+import json, os, sys, time, platform, subprocess, shlex, statistics
+from data.data_generator import generate_rectangles
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+#------------------------------------------------------------------------------------------------------------#
+#---------------------------------------- Define benchmark functions ----------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def __prepare_dataset(work_dir, size, corrupted_ratio, seed): # Internal use only, cannot call out when the module is being imported
+    dataset_dir = Path(work_dir).joinpath(f"rectangles_{size}_{corrupted_ratio}_{seed}", "data")
+    done_marker = dataset_dir.parent.joinpath(".generated")
+
+    if not done_marker.exists(): # Generated datasets are reused by the next benchmark runs
+        logger.info(f"Generating {size} rectangle files ({corrupted_ratio:.0%} corrupted) in {dataset_dir}\n")
+        generate_rectangles(dataset_dir, count=size, corrupted_ratio=corrupted_ratio, seed=seed)
+        done_marker.touch()
+
+    return dataset_dir
+
+
+def __percentile(sorted_values, fraction): # Internal use only, cannot call out when the module is being imported
+    if not sorted_values:
+        return None
+
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def __run_cli_once(dataset_dir, cores, cli_args): # Internal use only, cannot call out when the module is being imported
+    output_dir = dataset_dir.parent.joinpath(f"result_{cores}_cores")
+    command = [sys.executable, str(PROJECT_DIR.joinpath("rectangle_module.py")), "-i", str(dataset_dir), "-o", str(output_dir), "-c", str(cores), *cli_args]
+
+    start_ns = time.time_ns()
+    start_counter = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0) # The rusage of this run only, including its waited-for pool workers
+    wall_seconds = time.perf_counter() - start_counter
+    exit_code = os.waitstatus_to_exitcode(status)
+
+    latencies = sorted(
+        (entry.stat().st_mtime_ns - start_ns) / 1e9
+        for entry in os.scandir(output_dir) if entry.is_file() and not entry.name.startswith(".")
+    ) if output_dir.is_dir() else []
+
+    return {
+        "cores": cores,
+        "exit_code": exit_code,
+        "wall_seconds": wall_seconds,
+        "result_files": len(latencies),
+        "latency_seconds": {
+            "p50": __percentile(latencies, 0.50),
+            "p90": __percentile(latencies, 0.90),
+            "p99": __percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None
+        },
+        "peak_rss_mb": rusage.ru_maxrss / 1024 # ru_maxrss is in kilobytes on Linux
+    }
+
+
+def __parse_import_times(importtime_output): # Internal use only, cannot call out when the module is being imported
+    top_level_imports = {}
+
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        _, cumulative_us, module_name = line.split("|")
+        if module_name.startswith(" ") and not module_name.startswith("  "): # One space: imported by the script itself
+            top_level_imports[module_name.strip()] = int(cumulative_us)
+    
+    return top_level_imports
+
+
+def run_startup_benchmark(repeats=20, top=10):
+    '''
+    repeats: the number of cold starts of every measured command
+    top: the number of slowest top-level imports kept in the report
+
+    return: the cold start report as a dictionary, for the -l/-w fast path and for the full program
+    '''
+    commands = {
+        "fast_path": ["-l", "2", "-w", "3"],
+        "full_program": ["-l", "2", "-w", "3", "-c", "1"] # Any other option skips the fast path
+    }
+    startup_report = {"repeats": repeats}
+
+    for command_name, cli_args in commands.items():
+        command = [sys.executable, str(PROJECT_DIR.joinpath("rectangle_module.py")), *cli_args]
+        wall_seconds = []
+
+        for _ in range(repeats):
+            start_counter = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=PROJECT_DIR)
+            wall_seconds.append(time.perf_counter() - start_counter)
+        
+        importtime_run = subprocess.run([sys.executable, "-X", "importtime", *command[1:]], capture_output=True, text=True, cwd=PROJECT_DIR)
+        top_level_imports = __parse_import_times(importtime_run.stderr)
+
+        startup_report[command_name] = {
+            "wall_seconds_median": statistics.median(wall_seconds),
+            "wall_seconds_min": min(wall_seconds),
+            "import_seconds_total": sum(top_level_imports.values()) / 1e6,
+            "slowest_imports_seconds": {
+                module_name: cumulative_us / 1e6
+                for module_name, cumulative_us in sorted(top_level_imports.items(), key=lambda item: -item[1])[:top]
+            }
+        }
+
+        logger.info(
+            f"{command_name}: median cold start {startup_report[command_name]['wall_seconds_median'] * 1000:.1f} ms, "
+            f"imports {startup_report[command_name]['import_seconds_total'] * 1000:.1f} ms\n"
+        )
+    
+    return startup_report
+
+
+def run_benchmark(sizes, corruption_rates, max_cores, work_dir, seed=0, cli_args=()):
+    '''
+    sizes: the numbers of rectangle files of the generated datasets
+    corruption_rates: the fractions of corrupted files of the generated datasets
+    max_cores: the CLI is run with --cores 1, 2, ..., max_cores on every dataset
+    work_dir: the directory storing the generated datasets and the results of the runs
+    seed: the seed of the data generator
+    cli_args: extra arguments passed to every CLI run (e.g. ["-f", "csv"] or ["--async-io"])
+
+    return: the benchmark report as a dictionary
+    '''
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cli_args": list(cli_args),
+        "runs": []
+    }
+
+    for size in sizes:
+        for corrupted_ratio in corruption_rates:
+            dataset_dir = __prepare_dataset(work_dir, size, corrupted_ratio, seed)
+            single_core_throughput = None
+
+            for cores in range(1, max_cores + 1):
+                run = __run_cli_once(dataset_dir, cores, cli_args)
+                run["size"] = size
+                run["corrupted_ratio"] = corrupted_ratio
+                run["throughput_files_per_second"] = size / run["wall_seconds"]
+
+                if cores == 1:
+                    single_core_throughput = run["throughput_files_per_second"]
+
+                run["scaling_efficiency"] = run["throughput_files_per_second"] / (cores * single_core_throughput)
+                report["runs"].append(run)
+
+                logger.info(
+                    f"size={size} corrupted={corrupted_ratio:.0%} cores={cores}: "
+                    f"{run['throughput_files_per_second']:.0f} files/s, p50 latency={run['latency_seconds']['p50']}, "
+                    f"peak RSS={run['peak_rss_mb']:.1f} MB, efficiency={run['scaling_efficiency']:.2f}\n"
+                )
+
+                if run["exit_code"] != 0:
+                    logger.error(f"The CLI exited with code {run['exit_code']} (size={size}, cores={cores})\n")
+
+    return report
+
+
+#--------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define parse_args() function --------------------------------------#
+#--------------------------------------------------------------------------------------------------------------#
+
+def __parse_args():
+    formatter = lambda prog: HelpFormatter(prog, width=200, max_help_position=50)
+
+    parser = ArgumentParser(
+        prog = "Rectangle Calculator Benchmark",
+        description = "Benchmark rectangle_module.py across input sizes, corruption rates and core counts.",
+        add_help = True,
+        formatter_class = formatter
+    )
+
+    parser.add_argument("--sizes", required=False, default=[1000, 100000, 1000000], type=int, nargs="+", metavar="\b", help="The numbers of rectangle files of the generated datasets (default: 1000 100000 1000000).")
+    parser.add_argument("--corruption-rates", required=False, default=[0.1], type=float, nargs="+", metavar="\b", help="The fractions of corrupted files of the generated datasets (default: 0.1).")
+    parser.add_argument("--max-cores", required=False, default=os.cpu_count(), type=int, metavar="\b", help="The CLI is run with --cores 1, 2, ..., max-cores (default: all CPU cores).")
+    parser.add_argument("--work-dir", required=False, default="benchmark_data", metavar="\b", help="The directory storing the generated datasets and the results of the runs (default: benchmark_data).")
+    parser.add_argument("--seed", required=False, default=0, type=int, metavar="\b", help="The seed of the data generator (default: 0).")
+    parser.add_argument("--cli-args", required=False, default="", metavar="\b", help='Extra arguments passed to every CLI run, e.g. "-f csv" or "--async-io".')
+    parser.add_argument("--startup-repeats", required=False, default=20, type=int, metavar="\b", help="The number of cold starts measured for the startup report (default: 20).")
+    parser.add_argument("--startup-only", required=False, action="store_true", help="Only measure the cold start of the CLI, skip the dataset runs.")
+    parser.add_argument("--report", required=False, default="bench_report.json", metavar="\b", help="The path to the machine-readable JSON report (default: bench_report.json).")
+
+    return parser.parse_args()
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define main() function ------------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def main():
+    args = __parse_args()
+
+    if args.startup_only:
+        report = {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()}
+    
+    else:
+        report = run_benchmark(
+            sizes = args.sizes,
+            corruption_rates = args.corruption_rates,
+            max_cores = args.max_cores,
+            work_dir = args.work_dir,
+            seed = args.seed,
+            cli_args = shlex.split(args.cli_args)
+        )
+    
+    report["startup"] = run_startup_benchmark(repeats=args.startup_repeats)
+
+    with open(args.report, "w") as json_pointer:
+        json.dump(report, json_pointer, indent=4)
+
+    logger.info(f"The benchmark report is saved in {args.report}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,23 @@
+'''
+Generate rectangle inputs for rectangle_module.py, with some corrupted lengths / widths.
+
+Usage (from the repository root):
+    python 02_Python_class_OOP/rectangle_project/data/data_generator.py                       # the 200 rectangle_N.json files of this directory
+    python 02_Python_class_OOP/rectangle_project/data/data_generator.py -n 1000000 -f jsonl -s 16 --seed 42 -o /tmp/rectangles
+    python 02_Python_class_OOP/rectangle_project/data/data_generator.py -n 100000 -f json -s 10 -r 0.3 -o /tmp/rectangles
+'''
+
 import json
+import os
 import random
+import multiprocessing
 from pathlib import Path
+from argparse import ArgumentParser, ArgumentTypeError, HelpFormatter
+import numpy as np
 from loguru import logger
 
-# Randomly select 20 file numbers to be corrupted
-corrupted_indices = random.sample(range(1, 201), 20)
-logger.info(f"Corrupted files will be: {sorted(corrupted_indices)}")
-
 corruption_types = [
-    lambda x: str(x),  # Convert number to string
+    lambda x: f"{x}cm",  # Number with a unit (str(x) alone is a valid input for rectangle_module.py)
     lambda x: "abc",   # Non-numeric string
     lambda x: "?$#%",  # Special characters
     lambda x: "",      # Empty string
@@ -20,49 +29,214 @@ corruption_types = [
     lambda x: "NaN",   # Not a Number string
 ]
 
-# Generate all 200 files
-for i in range(1, 201):
+output_formats = ["json", "jsonl", "parquet"]
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define generator functions --------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def __generate_shard_values(seed, shard_index, first_number, count, corrupted_ratio): # Internal use only, cannot call out when the module is being imported
+    rng = np.random.default_rng([seed, shard_index]) # Every shard has its own stream, the result does not depend on the number of cores
+
     # Generate random dimensions between 1.0 and 100.0
-    length = round(random.uniform(1.0, 100.0), 1)
-    width = round(random.uniform(1.0, 100.0), 1)
-    
-    # Check if this file should be corrupted
-    if i in corrupted_indices:
-        # Decide which field(s) to corrupt
-        corrupt_length = random.choice([True, False])
-        corrupt_width = random.choice([True, False])
-        
-        # Ensure at least one field is corrupted
-        if not corrupt_length and not corrupt_width:
-            corrupt_length = True
-        
+    lengths = rng.uniform(1.0, 100.0, count).round(1).tolist()
+    widths = rng.uniform(1.0, 100.0, count).round(1).tolist()
+
+    # Randomly select the rectangles to be corrupted
+    corrupted_positions = np.sort(rng.choice(count, size=round(count * corrupted_ratio), replace=False)).tolist()
+
+    for position in corrupted_positions:
+        # Decide which field(s) to corrupt, at least one field is corrupted
+        corrupt_length, corrupt_width = [(True, False), (False, True), (True, True)][rng.integers(3)]
+
         if corrupt_length:
-            corruption_func = random.choice(corruption_types)
-            length = corruption_func(length)
-        
+            lengths[position] = corruption_types[rng.integers(len(corruption_types))](lengths[position])
+
         if corrupt_width:
-            corruption_func = random.choice(corruption_types)
-            width = corruption_func(width)
-    
-    data = {
-        "length": length,
-        "width": width
-    }
-    
-    filename = f"rectangle_{i}.json"
-    filepath = Path("02_Python_class_OOP/rectanble_project/data").joinpath(filename)
-    
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=4)
-
-logger.info(f"Generated 200 rectangle files (180 valid, 20 corrupted)")
-logger.info("Corrupted files are randomly distributed among rectangle_1.json to rectangle_200.json")
-
-# Print some examples of corrupted files
-logger.info("\nExamples of some corrupted files:")
-sample_corrupted = random.sample(corrupted_indices, min(5, len(corrupted_indices)))
-for i in sample_corrupted:
-    filepath = Path("02_Python_class_OOP/rectanble_project/data").joinpath(f'rectangle_{i}.json')
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    logger.error(f"rectangle_{i}.json: {data}")
+            widths[position] = corruption_types[rng.integers(len(corruption_types))](widths[position])
+
+    corrupted_numbers = [first_number + position for position in corrupted_positions]
+
+    return lengths, widths, corrupted_numbers
+
+
+def _generate_shard(output_path, output_format, seed, shard_index, first_number, count, corrupted_ratio):
+    '''
+    Generate and write the rectangles numbered first_number ... first_number + count - 1 of one shard,
+    return the numbers of the corrupted rectangles.
+    '''
+    lengths, widths, corrupted_numbers = __generate_shard_values(seed, shard_index, first_number, count, corrupted_ratio)
+    output_path = Path(output_path)
+
+    match output_format:
+        case "json": # One file per rectangle, in the shard directory
+            output_path.mkdir(exist_ok=True, parents=True)
+
+            for number, (length, width) in enumerate(zip(lengths, widths), start=first_number):
+                with open(output_path.joinpath(f"rectangle_{number}.json"), "w") as f:
+                    json.dump({"length": length, "width": width}, f, indent=4)
+
+        case "jsonl": # One line per rectangle, in one shard file
+            output_path.parent.mkdir(exist_ok=True, parents=True)
+
+            with open(output_path, "w", buffering=1024 * 1024) as f:
+                f.writelines(json.dumps({"length": length, "width": width}) + "\n" for length, width in zip(lengths, widths))
+
+        case "parquet": # Raw values are kept as strings (null for None), since corrupted values are not numbers
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            output_path.parent.mkdir(exist_ok=True, parents=True)
+            table = pa.table({
+                "number": pa.array(range(first_number, first_number + count), type=pa.int64()),
+                "length": pa.array([None if length is None else str(length) for length in lengths], type=pa.string()),
+                "width": pa.array([None if width is None else str(width) for width in widths], type=pa.string())
+            })
+            pq.write_table(table, output_path)
+
+    return corrupted_numbers
+
+
+def generate_dataset(output_dir, count=200, corrupted_ratio=0.1, seed=None, output_format="json", shards=1, cores=None):
+    '''
+    output_dir: the directory to write the rectangles into (created if needed)
+    count: the number of rectangles to generate
+    corrupted_ratio: the fraction of rectangles having a corrupted length and/or width
+    seed: the seed of the random generator, the same seed (and number of shards) always generates the same rectangles
+    output_format: "json" (one rectangle_N.json file per rectangle), "jsonl" or "parquet" (one file per shard)
+    shards: the number of shards, each one is a subdirectory ("json") or a file ("jsonl", "parquet"), written in parallel
+    cores: the number of CPU cores writing the shards (default: all CPU cores)
+
+    return: the sorted list of the corrupted rectangle numbers
+    '''
+    if output_format not in output_formats:
+        raise ValueError(f'Unknown output format "{output_format}", expected one of {output_formats}')
+
+    if count < 1:
+        raise ValueError(f"The number of rectangles must be at least 1, got {count}")
+
+    if not 0 <= corrupted_ratio <= 1:
+        raise ValueError(f"The corrupted ratio must be between 0 and 1, got {corrupted_ratio}")
+
+    if (cores is not None) and (cores < 1):
+        raise ValueError(f"The number of cores must be at least 1, got {cores}")
+
+    if output_format == "parquet":
+        import pyarrow # Fail early, before starting the worker processes
+
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    output_dir = Path(output_dir)
+    shards = max(1, min(shards, count))
+    suffix = "" if output_format == "json" else f".{output_format}"
+
+    shard_arguments = []
+    for shard_index, numbers in enumerate(np.array_split(np.arange(1, count + 1), shards)):
+        if len(numbers) == 0: # More shards than rectangles
+            continue
+
+        if shards == 1:
+            output_path = output_dir if output_format == "json" else output_dir.joinpath(f"rectangles{suffix}")
+
+        else:
+            output_path = output_dir.joinpath(f"shard_{shard_index:05d}{suffix}")
+
+        shard_arguments.append((output_path, output_format, seed, shard_index, int(numbers[0]), len(numbers), corrupted_ratio))
+
+    if shards == 1:
+        corrupted_numbers = [_generate_shard(*shard_arguments[0])]
+
+    else:
+        with multiprocessing.Pool(processes=min(cores or os.cpu_count(), shards)) as pool:
+            corrupted_numbers = pool.starmap(_generate_shard, shard_arguments)
+
+    return sorted(number for shard_numbers in corrupted_numbers for number in shard_numbers)
+
+
+def generate_rectangles(output_dir, count=200, corrupted_ratio=0.1, seed=None):
+    '''
+    Generate count rectangle_N.json files directly in output_dir,
+    return the sorted list of the corrupted file numbers.
+    '''
+    return generate_dataset(output_dir, count=count, corrupted_ratio=corrupted_ratio, seed=seed)
+
+
+#--------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define parse_args() function --------------------------------------#
+#--------------------------------------------------------------------------------------------------------------#
+
+def __parse_args():
+    formatter = lambda prog: HelpFormatter(prog, width=200, max_help_position=50)
+
+    parser = ArgumentParser(
+        prog = "Rectangle Data Generator",
+        description = "Generate rectangle inputs (with some corrupted ones) for rectangle_module.py.",
+        add_help = True,
+        formatter_class = formatter
+    )
+
+    def positive_int(value):
+        if (not value.isdigit()) or int(value) < 1:
+            raise ArgumentTypeError(f'expected an integer >= 1, got "{value}"')
+        return int(value)
+
+    def ratio(value):
+        try:
+            number = float(value)
+        except ValueError:
+            number = None
+
+        if (number is None) or not (0 <= number <= 1):
+            raise ArgumentTypeError(f'expected a number between 0 and 1, got "{value}"')
+        return number
+
+    parser.add_argument("-o", "--output-dir", required=False, default=str(Path(__file__).resolve().parent), metavar="\b", help="The directory to write the rectangles into (default: the directory of this script).")
+
+    parser.add_argument("-n", "--count", required=False, default=200, type=positive_int, metavar="\b", help="The number of rectangles to generate (default: 200).")
+    parser.add_argument("-r", "--corrupted-ratio", required=False, default=0.1, type=ratio, metavar="\b", help="The fraction of rectangles having a corrupted length and/or width (default: 0.1).")
+    parser.add_argument("--seed", required=False, default=None, type=int, metavar="\b", help="The seed of the random generator (default: a random seed, displayed in the logs).")
+    parser.add_argument("-f", "--format", required=False, default="json", choices=output_formats, metavar="\b", help='"json" (one file per rectangle, default), "jsonl" or "parquet" (one file per shard, parquet requires pyarrow).')
+    parser.add_argument("-s", "--shards", required=False, default=1, type=positive_int, metavar="\b", help="The number of shards (subdirectories or files) written in parallel (default: 1).")
+    parser.add_argument("-c", "--cores", required=False, default=os.cpu_count(), type=positive_int, metavar="\b", help="The number of CPU cores writing the shards (default: all CPU cores).")
+
+    return parser.parse_args()
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define main() function ------------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def main():
+    args = __parse_args()
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    logger.info(f"Generating {args.count} rectangles in {args.output_dir} (format={args.format}, shards={args.shards}, seed={seed})")
+
+    corrupted_numbers = generate_dataset(
+        output_dir = args.output_dir,
+        count = args.count,
+        corrupted_ratio = args.corrupted_ratio,
+        seed = seed,
+        output_format = args.format,
+        shards = args.shards,
+        cores = args.cores
+    )
+
+    logger.info(f"Generated {args.count} rectangles ({args.count - len(corrupted_numbers)} valid, {len(corrupted_numbers)} corrupted)")
+
+    if len(corrupted_numbers) <= 50:
+        logger.info(f"Corrupted rectangles are: {corrupted_numbers}")
+
+    # Print some examples of corrupted files
+    if args.format == "json" and args.shards == 1:
+        logger.info("\nExamples of some corrupted files:")
+        for i in random.sample(corrupted_numbers, min(5, len(corrupted_numbers))):
+            filepath = Path(args.output_dir).joinpath(f"rectangle_{i}.json")
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+            logger.error(f"rectangle_{i}.json: {data}")
+
+
+if __name__ == "__main__":
+    main()
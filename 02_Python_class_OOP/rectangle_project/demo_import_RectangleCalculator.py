@@ -145,6 +145,64 @@ print(rectangle.summary())
 # ++ Perimeter = 2 * (33 + 25.5) = 117.0
 # ++ Area = 33 * 25.5 = 841.5
 
+
+#---------------------------------------------------------------------------------------------------------------------------#
+#----------------------------- Compute many rectangles at once (vectorized batch computing) --------------------------------#
+#---------------------------------------------------------------------------------------------------------------------------#
+
+import numpy as np
+
+lengths = np.array([355, 55, -3, 33])
+widths = np.array([263, 23, 4, np.nan])
+
+perimeters, areas, valid_mask = RectangleCalculator.compute_batch(lengths, widths)
+
+print(perimeters) # [1236.  156.   nan   nan]
+print(areas) # [93365.  1265.    nan    nan]
+print(valid_mask) # [ True  True False False]
+
+# Raw values (e.g. loaded from JSON files) are validated with the same rule as the rectangle object
+perimeters, areas, valid_mask = RectangleCalculator.compute_batch(["68.7", "abc", None], [80.2, 2, 3])
+
+print(perimeters) # [297.8   nan   nan]
+print(valid_mask) # [ True False False]
+
+'''
+compute_batch() is a static method, it does not create any rectangle object.
+The whole arrays are validated and computed in one vectorized pass,
+which is much faster than creating millions of objects and calling .perimeter and .area on each of them.
+
+Arrow arrays (pyarrow.array([...])) are accepted as well.
+'''
+
+
+#---------------------------------------------------------------------------------------------------------------------------#
+#------------------------ Store many rectangles compactly (Rectangle records and RectangleBatch) ---------------------------#
+#---------------------------------------------------------------------------------------------------------------------------#
+
+from rectangle_module import Rectangle, RectangleBatch
+
+record = Rectangle(355, 263) # Data only: no input/output paths, no cores, no cached results
+
+print(record) # Rectangle(length=355, width=263)
+print(record.perimeter) # 1236
+print(record.area) # 93365
+
+batch = RectangleBatch.from_inputs(["68.7", "abc", 55], [80.2, 2, 23])
+
+print(batch) # RectangleBatch(3 rectangles, 96 bytes)
+print(batch.valid_mask) # [ True False  True]
+print(batch[0]) # Rectangle(length=68.7, width=80.2)
+print(batch.records["area"]) # [5509.74     nan 1265.  ]
+
+'''
+A RectangleCalculator object carries the whole run configuration (input, output, cores, formats...),
+so it is a heavy object to create for every rectangle.
+
+Rectangle has __slots__ (no __dict__), and RectangleBatch keeps all rectangles in one NumPy structured array,
+32 bytes per rectangle: 10 million rectangles take about 320 MB.
+'''
+
 #---------------------------------------------------------------------------------------------------------------------------#
 #--------------------------- Display everything of the RectangleCalculator (attributes and methods) ------------------------#
 #---------------------------------------------------------------------------------------------------------------------------#
@@ -152,11 +210,25 @@ print(rectangle.summary())
 for info in dir(RectangleCalculator):
     print(info)
 
+# _RectangleCalculator__async_pipeline
+# _RectangleCalculator__chunk_columns_workflow
+# _RectangleCalculator__corruption_reason
+# _RectangleCalculator__file_digest
+# _RectangleCalculator__holds_only_json_files
 # _RectangleCalculator__load_rectangle_inputs
+# _RectangleCalculator__plan_incremental_run
+# _RectangleCalculator__preflight_paths
+# _RectangleCalculator__save_json_result
+# _RectangleCalculator__save_manifest
 # _RectangleCalculator__save_output_file
+# _RectangleCalculator__save_quarantine
+# _RectangleCalculator__to_finite_float
+# _RectangleCalculator__to_float_array
+# _RectangleCalculator__to_json_safe
 # _RectangleCalculator__valiate_input_number
 # _RectangleCalculator__validate_output_directory
 # _RectangleCalculator__validate_output_file
+# _RectangleCalculator__validate_results_file
 # __class__
 # __delattr__
 # __dict__
@@ -184,9 +256,23 @@ for info in dir(RectangleCalculator):
 # __str__
 # __subclasshook__
 # __weakref__
+# _async_workflow
+# _bulk_batch_size
+# _bulk_suffixes
+# _bulk_workflow
+# _chunk_workflow
 # _display_saving_single_output_message
+# _manifest_name
+# _numeric_pattern
+# _output_formats
+# _pool_startup_seconds
+# _progress_name
+# _results_file_format
 # _single_workflow
+# _stream_bulk_inputs
+# _target_chunk_seconds
 # area
+# compute_batch
 # perimeter
 # summary
 
@@ -199,12 +285,26 @@ rectangle = RectangleCalculator()
 
 for info in dir(rectangle):
     print(info)
+# _RectangleCalculator__async_pipeline
+# _RectangleCalculator__chunk_columns_workflow
+# _RectangleCalculator__corruption_reason
+# _RectangleCalculator__file_digest
+# _RectangleCalculator__holds_only_json_files
 # _RectangleCalculator__length
 # _RectangleCalculator__load_rectangle_inputs
+# _RectangleCalculator__plan_incremental_run
+# _RectangleCalculator__preflight_paths
+# _RectangleCalculator__save_json_result
+# _RectangleCalculator__save_manifest
 # _RectangleCalculator__save_output_file
+# _RectangleCalculator__save_quarantine
+# _RectangleCalculator__to_finite_float
+# _RectangleCalculator__to_float_array
+# _RectangleCalculator__to_json_safe
 # _RectangleCalculator__valiate_input_number
 # _RectangleCalculator__validate_output_directory
 # _RectangleCalculator__validate_output_file
+# _RectangleCalculator__validate_results_file
 # _RectangleCalculator__width
 # __class__
 # __delattr__
@@ -233,14 +333,46 @@ for info in dir(rectangle):
 # __str__
 # __subclasshook__
 # __weakref__
+# _async_io
+# _async_workflow
+# _auto_execution
+# _bulk_batch_size
+# _bulk_suffixes
+# _bulk_workflow
+# _chunk_size
+# _chunk_workflow
+# _cluster_address
+# _cluster_authkey
 # _cores
+# _corrupted_files
 # _display_saving_single_output_message
+# _execution
+# _incremental
 # _input
+# _input_kind
+# _io_concurrency
 # _json_count
+# _log_mode
+# _manifest_name
+# _metrics
+# _numeric_pattern
 # _output
+# _output_format
+# _output_formats
+# _poll_interval
+# _pool_startup_seconds
+# _progress_name
+# _quarantine_path
+# _quarantine_records
+# _results_file_format
+# _resume
 # _single_output_path
 # _single_workflow
+# _stream_bulk_inputs
+# _target_chunk_seconds
+# _watch
 # area
+# compute_batch
 # length
 # perimeter
 # summary
@@ -1,9 +1,55 @@
-from loguru import logger
-from pathlib import Path
-from argparse import ArgumentParser, HelpFormatter
-import json, re, shutil
-from termcolor import colored
-import multiprocessing
+import re, os, sys, time, math, signal, importlib
+from contextlib import nullcontext
+from itertools import islice
+
+
+#-----------------------------------------------------------------------------------------------------------#
+#--------------------------------- Define lazy imports of the heavy modules --------------------------------#
+#-----------------------------------------------------------------------------------------------------------#
+
+class _LazyImport:
+    '''
+    A module (or one of its attributes) imported on its first use only, then bound to its global name,
+    so a plain -l/-w call never pays for importing loguru, NumPy, asyncio or multiprocessing.
+    '''
+    __slots__ = ("global_name", "module_name", "attribute")
+
+    def __init__(self, global_name, module_name, attribute=None):
+        self.global_name = global_name
+        self.module_name = module_name
+        self.attribute = attribute
+
+
+    def _resolve(self):
+        value = importlib.import_module(self.module_name)
+        if self.attribute is not None:
+            value = getattr(value, self.attribute)
+        
+        globals()[self.global_name] = value # The next uses find the real object, not this proxy
+        return value
+
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+
+logger = _LazyImport("logger", "loguru", "logger")
+Path = _LazyImport("Path", "pathlib", "Path")
+json = _LazyImport("json", "json")
+colored = _LazyImport("colored", "termcolor", "colored")
+np = _LazyImport("np", "numpy")
+shutil = _LazyImport("shutil", "shutil")
+csv = _LazyImport("csv", "csv")
+hashlib = _LazyImport("hashlib", "hashlib")
+queue = _LazyImport("queue", "queue")
+threading = _LazyImport("threading", "threading")
+multiprocessing = _LazyImport("multiprocessing", "multiprocessing")
+asyncio = _LazyImport("asyncio", "asyncio")
+ThreadPoolExecutor = _LazyImport("ThreadPoolExecutor", "concurrent.futures", "ThreadPoolExecutor")
 
 
 #-----------------------------------------------------------------------------------------------------------#
@@ -15,19 +61,47 @@ class RectangleCalculator:
     This class will takes the length and width of a rectangle as inputs, 
     then return the corresponding perimeter and area as outputs.
 
-    It can also read inputs from multiple JSON files.
-    The results can be returned in a specified JSON file.
+    It can also read inputs from multiple JSON files,
+    or stream them from one bulk JSON Lines / CSV file.
+    The results can be returned in a specified JSON file,
+    or all together in one JSON Lines / CSV / Parquet / Arrow file.
     The class supports multicore computing.
+    Many rectangles can also be computed at once with the vectorized compute_batch(),
+    or stored compactly as Rectangle records / a RectangleBatch (data only, without the run configuration).
     '''
 
+    _numeric_pattern = re.compile(r"^\+?\d+\.?\d*$") # Compiled once, shared by every instance and compute_batch()
+    _bulk_suffixes = (".jsonl", ".csv") # Input files holding many rectangles, one per line
+    _bulk_batch_size = 65536 # The number of rectangles streamed from a bulk file and computed at once
+    _output_formats = {"json": ".json", "jsonl": ".jsonl", "csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+    _manifest_name = ".rectangle_manifest.json" # Stored in the output directory by the incremental mode
+    _progress_name = ".rectangle_progress.log" # Stored in the output directory, the input files already done (for --resume)
+    _pool_startup_seconds = 0.1 # About the cost of starting a process pool, smaller workloads run serially with --cores auto
+    _target_chunk_seconds = 0.05 # The amount of work per chunk chosen by --cores auto, large enough to hide the IPC cost
+
 
     def __init__(self, length=None, width=None):
         '''
-        input: the path leading to an input directory containing JSON files, or directly to a specified JSON file
+        input: the path leading to an input directory containing JSON files, or directly to a specified JSON file (or a bulk JSON Lines / CSV file)
         output: the path leading to on output directory to store the results in JSON files, or directly to a specified JSON file
         length: the length of the rectangle (for inplace calculating)
         width: the width of the rectangle (for inplace calculating)
         cores: the number of CPU cores using for parallel computing
+        auto_execution: measure the cost of a sample of files, then choose serial, thread or process execution, the cores and the chunk size
+        execution: "process" (a process pool), "thread" (the asyncio pipeline) or "serial" (in this process), chosen by auto_execution
+        chunk_size: the number of JSON files sent to a CPU core at once (0 means automatically computed)
+        output_format: "json" saves one JSON file per rectangle, "jsonl", "csv", "parquet" or "arrow" saves all results in one file
+        incremental: only compute the new or changed input JSON files, keep the results of the unchanged ones
+        resume: continue an interrupted run, skip the input JSON files recorded in its progress log
+        watch: keep running and compute every new or changed JSON file dropped into the input directory
+        poll_interval: the number of seconds between two scans of the watched input directory
+        async_io: compute the JSON files with an asyncio pipeline (overlapped reads, compute and writes) instead of a process pool
+        io_concurrency: the maximum number of JSON files read (or written) at the same time by the asyncio pipeline
+        metrics: the per-stage timers and counters of the workflow (disabled by default, almost free when disabled)
+        log_mode: "full" logs every corrupted file, "fast" reports them once as a count (with background log sinks)
+        quarantine_path: the JSON Lines file collecting every corrupted input (path, field, raw value, reason) instead of logging it
+        cluster_address: "HOST:PORT" to send the chunks to worker nodes through a TCP work queue instead of a local process pool
+        cluster_authkey: the shared secret of the coordinator and its worker nodes
         '''
         self._input = ''
         self._output = ''
@@ -36,8 +110,26 @@ class RectangleCalculator:
         self.__length = None
         self.__width = None
         self._cores = 2
+        self._auto_execution = False
+        self._execution = "process"
+        self._chunk_size = 0
+        self._output_format = "json"
+        self._incremental = False
+        self._resume = False
+        self._watch = False
+        self._poll_interval = 0.1
+        self._async_io = False
+        self._io_concurrency = 64
+        self._metrics = RectangleMetrics(enabled=False)
+        self._log_mode = "full"
+        self._cluster_address = ""
+        self._cluster_authkey = b"rectangle"
+        self._corrupted_files = [] # Corrupted file names waiting to be reported at once, in the "fast" log mode
+        self._quarantine_path = ""
+        self._quarantine_records = [] # (path, line, field, raw value, reason) of the corrupted inputs, saved once by the parent process
         self._single_output_path = None
         self._json_count = 0
+        self._input_kind = None # "directory", "file" or "missing", resolved once by __preflight_paths() and shared with the workers
 
 
     def __validate_output_directory(self): # Internal use only, cannot call out when the module is being imported
@@ -55,9 +147,7 @@ class RectangleCalculator:
                 else:
                     self._output = Path(self._output)
                 
-                non_json_count = sum([1 for _ in self._output.rglob("*[!.json]")]) # Ensure the directory contains only json file
-                
-                if (self._output.is_dir()) and (non_json_count == 0):
+                if RectangleCalculator.__holds_only_json_files(self._output) and (not self._incremental) and (not self._resume): # Both modes keep the previous results
                     shutil.rmtree(self._output)
                 
                 self._output.mkdir(exist_ok=True, parents=True)
@@ -65,11 +155,161 @@ class RectangleCalculator:
         return self._output
 
 
+    @staticmethod
+    def __holds_only_json_files(directory): # Internal use only, cannot call out when the module is being imported
+        '''
+        Return True if the directory exists and only contains ".json" files and the progress log (so it is safe to be cleaned),
+        one scan of its direct entries, stopped at the first entry that is not a JSON file (a sub-directory included).
+        '''
+        try:
+            with os.scandir(directory) as entries:
+                return all(
+                    entry.is_file() and (entry.name.endswith(".json") or entry.name == RectangleCalculator._progress_name)
+                    for entry in entries
+                )
+        
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+
+
+    def __preflight_paths(self): # Internal use only, cannot call out when the module is being imported
+        '''
+        Resolve the kind of the input path once ("directory", "file" or "missing"),
+        instead of asking the filesystem again for every rectangle.
+        Called by the parent process before the workers start, so they receive it already resolved.
+        '''
+        if self._input_kind is None:
+            if str(self._input) == "":
+                self._input_kind = "missing"
+            
+            elif Path(self._input).is_dir():
+                self._input_kind = "directory"
+            
+            elif Path(self._input).is_file():
+                self._input_kind = "file"
+            
+            else:
+                self._input_kind = "missing"
+        
+        return self._input_kind
+
+
+    @staticmethod
+    def __file_digest(file_path): # Internal use only, cannot call out when the module is being imported
+        with open(file_path, "rb") as file_pointer:
+            return hashlib.blake2b(file_pointer.read(), digest_size=16).hexdigest()
+
+
+    def __plan_incremental_run(self, json_rectangle_files): # Internal use only, cannot call out when the module is being imported
+        '''
+        Compare the input JSON files with the manifest of the previous run (kept in the output directory),
+        return the files that must be computed again and the manifest of the current run.
+
+        A file is unchanged if its size and modification time are the same as before,
+        or if only its modification time changed but its content hash is still the same.
+        '''
+        manifest_path = Path(self._output).joinpath(RectangleCalculator._manifest_name)
+        
+        try:
+            with open(manifest_path, "r") as json_pointer:
+                old_manifest = json.load(json_pointer)
+        
+        except (FileNotFoundError, json.JSONDecodeError):
+            old_manifest = {}
+        
+        new_manifest = {}
+        changed_files = []
+
+        for json_rectangle_file in json_rectangle_files:
+            stat = self._input.joinpath(json_rectangle_file).stat()
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": None}
+            old_entry = old_manifest.get(json_rectangle_file)
+
+            if old_entry is None:
+                entry["digest"] = RectangleCalculator.__file_digest(self._input.joinpath(json_rectangle_file)) # Kept for the next runs
+                changed_files.append(json_rectangle_file) # A new input file
+            
+            elif (old_entry["size"], old_entry["mtime_ns"]) == (entry["size"], entry["mtime_ns"]):
+                entry["digest"] = old_entry["digest"] # Unchanged, not even opened
+                if entry["digest"] is None: # Recorded by an older version without its digest
+                    entry["digest"] = RectangleCalculator.__file_digest(self._input.joinpath(json_rectangle_file))
+            
+            else:
+                entry["digest"] = RectangleCalculator.__file_digest(self._input.joinpath(json_rectangle_file))
+                if entry["digest"] != old_entry["digest"]:
+                    changed_files.append(json_rectangle_file)
+            
+            new_manifest[json_rectangle_file] = entry
+        
+        # Remove the stale results of the changed inputs (a corrupted input must not keep its old result) and of the deleted inputs
+        for json_rectangle_file in changed_files + [name for name in old_manifest if name not in new_manifest]:
+            Path(self._output).joinpath(json_rectangle_file).unlink(missing_ok=True)
+        
+        logger.debug(f"Incremental mode: {len(changed_files)} new or changed input files, {len(json_rectangle_files) - len(changed_files)} unchanged files are skipped\n")
+
+        return changed_files, new_manifest
+
+
+    def __save_manifest(self, manifest): # Internal use only, cannot call out when the module is being imported
+        manifest_path = Path(self._output).joinpath(RectangleCalculator._manifest_name)
+        temporary_path = manifest_path.with_suffix(".tmp")
+
+        with open(temporary_path, "w") as json_pointer:
+            json.dump(manifest, json_pointer)
+        
+        temporary_path.replace(manifest_path) # Atomic, a killed run never leaves a half-written manifest
+
+
+    @staticmethod
+    def __to_json_safe(raw_value): # Internal use only, cannot call out when the module is being imported
+        # NaN / Infinity (e.g. {"length": NaN} or 1e400 in a bulk input) are written as strings, bare NaN is not valid JSON
+        if isinstance(raw_value, float) and not math.isfinite(raw_value):
+            return str(raw_value)
+        
+        if isinstance(raw_value, (list, tuple)):
+            return [RectangleCalculator.__to_json_safe(value) for value in raw_value]
+        
+        if isinstance(raw_value, dict):
+            return {key: RectangleCalculator.__to_json_safe(value) for key, value in raw_value.items()}
+        
+        return raw_value
+
+
+    def __save_quarantine(self): # Internal use only, cannot call out when the module is being imported
+        '''
+        Write the corrupted inputs collected by the whole run to the quarantine file (one JSON object per corrupted field),
+        then display their counts per reason instead of one error per file.
+        '''
+        from collections import Counter
+
+        quarantine_path = Path(self._quarantine_path)
+        quarantine_path.parent.mkdir(exist_ok=True, parents=True)
+
+        with open(quarantine_path, "w") as file_pointer:
+            for path, line_number, field, raw_value, reason in self._quarantine_records:
+                record = {"path": path, "field": field, "raw": RectangleCalculator.__to_json_safe(raw_value), "reason": reason}
+                if line_number is not None:
+                    record["line"] = line_number # Only for the bulk JSON Lines / CSV inputs
+                
+                file_pointer.write(json.dumps(record, default=str, allow_nan=False) + "\n")
+        
+        corrupted_inputs = len({(path, line_number) for path, line_number, *_ in self._quarantine_records})
+        reason_counts = Counter(reason for *_, reason in self._quarantine_records)
+        quarantine_file = colored(str(quarantine_path), (139, 0, 0), attrs=["bold"])
+        
+        if corrupted_inputs == 0:
+            logger.info(f"No corrupted input was found, the quarantine file {quarantine_file} is empty\n")
+        
+        else:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in reason_counts.most_common())
+            logger.warning(f"{corrupted_inputs} CORRUPTED inputs ({len(self._quarantine_records)} fields) are quarantined in {quarantine_file} ({reasons})\n")
+
+
     def __validate_output_file(self, json_output_file): # Internal use only, cannot call out when the module is being imported
         if str(json_output_file) == "":
             return None
         
-        elif (str(self._input) != "") and (Path(self._input).is_dir()):
+        elif self.__preflight_paths() == "directory":
             
             if self._json_count >= 2:
                 json_output_file = Path(self._output).joinpath(json_output_file)
@@ -85,9 +325,7 @@ class RectangleCalculator:
         
         
         if json_output_file.suffix == "":
-            non_json_count = sum([1 for _ in json_output_file.rglob("*[!.json]")]) # Ensure the directory contains only json file
-            
-            if (json_output_file.is_dir()) and (non_json_count == 0):
+            if RectangleCalculator.__holds_only_json_files(json_output_file):
                 shutil.rmtree(json_output_file)
                 json_output_file.mkdir(exist_ok=True)
             
@@ -110,12 +348,11 @@ class RectangleCalculator:
 
     @staticmethod
     def __valiate_input_number(*numbers): # Internal use only, cannot call out when the module is being imported
-        numeric_pattern = r"^\+?\d+\.?\d*$"
         numbers = list(numbers)
         
         for idx, number in enumerate(numbers):
-            if re.match(numeric_pattern, str(number)):
-                numbers[idx] = float(number)
+            if RectangleCalculator._numeric_pattern.match(str(number)):
+                numbers[idx] = RectangleCalculator.__to_finite_float(number) # e.g. a 400-digit number is not a valid input
             
             else:
                 numbers[idx] = None
@@ -123,6 +360,183 @@ class RectangleCalculator:
         return numbers
 
 
+    @staticmethod
+    def __to_finite_float(number): # Internal use only, cannot call out when the module is being imported
+        '''
+        Return float(number), or None if it overflows or is not finite (the regex alone lets "1" * 400 pass).
+        '''
+        try:
+            number = float(number)
+        
+        except OverflowError: # A huge JSON integer
+            return None
+        
+        return number if math.isfinite(number) else None
+
+
+    @staticmethod
+    def __corruption_reason(raw_value): # Internal use only, cannot call out when the module is being imported
+        '''
+        Return why a raw length / width is rejected, or None if it is a valid number.
+        Only called for the corrupted inputs, the valid path never pays for it.
+        '''
+        if RectangleCalculator._numeric_pattern.match(str(raw_value)):
+            return None if RectangleCalculator.__to_finite_float(raw_value) is not None else "number too large"
+        
+        if raw_value is None:
+            return "missing value"
+        
+        if isinstance(raw_value, bool) or not isinstance(raw_value, (int, float, str)):
+            return "not a number"
+        
+        if isinstance(raw_value, str) and raw_value.strip() == "":
+            return "empty string"
+        
+        try:
+            number = float(raw_value)
+        
+        except ValueError:
+            return "not a number"
+        
+        except OverflowError:
+            return "number too large"
+        
+        if not math.isfinite(number):
+            return "not a finite number"
+        
+        if number < 0:
+            return "negative number"
+        
+        return "unsupported number format" # e.g. "1e3" or " 5"
+
+
+    @staticmethod
+    def __to_float_array(values): # Internal use only, cannot call out when the module is being imported
+        values = np.asarray(values) # Works for lists, NumPy arrays and Arrow arrays (through __array__)
+
+        if values.dtype.kind == "b": # True / False are rejected by the regex of a single rectangle, so they are rejected here too
+            return np.full(values.shape, np.nan), np.zeros(values.shape, dtype=bool)
+
+        if values.dtype.kind in "iu":
+            values = values.astype(np.float64, copy=False)
+            valid = values >= 0 # Same rule as the regex: no sign
+        
+        elif values.dtype.kind == "f":
+            values = values.astype(np.float64, copy=False)
+            valid = np.isfinite(values) & ~np.signbit(values) # Same rule as the regex: no sign (not even -0.0), no NaN, no infinity
+            with np.errstate(invalid="ignore"):
+                valid &= (values == 0) | ((values >= 1e-4) & (values < 1e16)) # str() writes the others with an exponent (1e-05, 1e+16), rejected by the regex
+        
+        else: # Strings, None or mixed objects (e.g. raw JSON values) still need the regex, but only one pass over them
+            numeric_pattern = RectangleCalculator._numeric_pattern
+            valid = np.fromiter((numeric_pattern.match(str(value)) is not None for value in values.ravel()), dtype=bool, count=values.size).reshape(values.shape)
+
+            try:
+                values = np.where(valid, values, "nan").astype(np.float64)
+            
+            except OverflowError: # A huge integer somewhere: convert one by one, the overflowing values become NaN
+                to_finite_float = RectangleCalculator.__to_finite_float
+                values = np.fromiter(
+                    (to_finite_float(value) if is_valid else np.nan for value, is_valid in zip(values.ravel(), valid.ravel())),
+                    dtype=np.float64, count=values.size
+                ).reshape(values.shape) # None (overflow) is stored as NaN
+
+            valid &= np.isfinite(values) # "1" * 400 matches the regex but is cast to infinity
+        
+        return values, valid
+
+
+    @staticmethod
+    def compute_batch(lengths, widths):
+        '''
+        lengths: an array-like (list, NumPy array, Arrow array...) of rectangle lengths
+        widths: an array-like of rectangle widths, with the same shape as lengths
+        
+        return: (perimeters, areas, valid_mask) as NumPy arrays
+                invalid rectangles have NaN perimeter and area, and False in valid_mask
+        '''
+        lengths, valid_lengths = RectangleCalculator.__to_float_array(lengths)
+        widths, valid_widths = RectangleCalculator.__to_float_array(widths)
+
+        if lengths.shape != widths.shape:
+            raise ValueError(f"lengths and widths must have the same shape, got {lengths.shape} and {widths.shape}")
+
+        valid_mask = valid_lengths & valid_widths
+
+        with np.errstate(invalid="ignore", over="ignore"): # Invalid slots are masked out right below
+            perimeters = np.where(valid_mask, 2 * (lengths + widths), np.nan)
+            areas = np.where(valid_mask, lengths * widths, np.nan)
+
+        return perimeters, areas, valid_mask
+
+
+    @staticmethod
+    def _stream_bulk_inputs(bulk_file):
+        '''
+        bulk_file: the path to a JSON Lines file (one {"length": ..., "width": ...} object per line)
+                   or to a CSV file (with "length" and "width" columns)
+        
+        yield: (line_number, length, width, line_problem) of every rectangle, one line at a time,
+               so the whole file is never loaded into memory
+               line_problem is None, or why a JSON line could not be read (its length and width are then None)
+        '''
+        bulk_file = Path(bulk_file)
+
+        with open(bulk_file, "r", newline="") as file_pointer:
+            if bulk_file.suffix == ".csv":
+                reader = csv.DictReader(file_pointer)
+                for row in reader:
+                    yield reader.line_num, row.get("length"), row.get("width"), None
+            
+            else:
+                for line_number, line in enumerate(file_pointer, start=1):
+                    if line.strip() == "":
+                        continue # Skip blank lines, usually the one at the end of the file
+
+                    try:
+                        record = json.loads(line)
+                        yield line_number, record.get("length"), record.get("width"), None
+                    
+                    except json.JSONDecodeError: # A broken line
+                        yield line_number, None, None, "invalid JSON"
+                    
+                    except AttributeError: # A valid JSON line which is not an object, e.g. [3, 4]
+                        yield line_number, None, None, 'not a {"length", "width"} object'
+
+
+    def _results_file_format(self):
+        '''
+        Return the format of the single file storing all results,
+        a bulk input file is saved as JSON Lines unless another one-file format was chosen.
+        '''
+        return "jsonl" if self._output_format == "json" else self._output_format
+
+
+    def __validate_results_file(self): # Internal use only, cannot call out when the module is being imported
+        if str(self._output) == "":
+            return None
+        
+        results_suffix = RectangleCalculator._output_formats[self._results_file_format()]
+        results_file = Path(self._output)
+
+        if results_file.suffix == "":
+            results_file.mkdir(exist_ok=True, parents=True)
+            results_file = results_file.joinpath(f"{Path(self._input).stem}_results{results_suffix}")
+
+            output_path = colored(str(results_file), (139, 0, 0), attrs=["bold"])
+            logger.warning(f"The given output path is a directory, all results are saved in one file {output_path}\n")
+        
+        elif results_file.suffix != results_suffix:
+            results_file = results_file.parent.joinpath(results_file.stem + results_suffix)
+
+            output_path = colored(str(results_file), (139, 0, 0), attrs=["bold"])
+            logger.warning(f'The given output file path does not end with "{results_suffix}", automatically set as {output_path}\n')
+        
+        results_file.parent.mkdir(exist_ok=True, parents=True)
+
+        return results_file
+
+
     def __load_rectangle_inputs(self, json_rectangle_file): # Internal use only, cannot call out when the module is being imported
         if len(Path(json_rectangle_file).parts) > 1:
             json_file_path = json_rectangle_file
@@ -130,21 +544,45 @@ class RectangleCalculator:
         else:
             json_file_path = self._input.joinpath(json_rectangle_file)
         
-        with open(json_file_path, "r") as json_pointer:
-            length, width = json.load(json_pointer).values()
-            length, width = RectangleCalculator.__valiate_input_number(length, width)
+        with self._metrics.stage("load"), open(json_file_path, "r") as json_pointer:
+            file_problem = None
+            
+            try:
+                raw_length, raw_width = json.load(json_pointer).values()
+            
+            except json.JSONDecodeError: # Broken JSON, e.g. a file still being written
+                raw_length, raw_width, file_problem = None, None, "invalid JSON"
+            
+            except (ValueError, AttributeError): # Not a {"length": ..., "width": ...} object
+                raw_length, raw_width, file_problem = None, None, 'not a {"length", "width"} object'
+        
+        with self._metrics.stage("validate"):
+            length, width = RectangleCalculator.__valiate_input_number(raw_length, raw_width)
         
-        if None in [length, width]:
-            json_rectangle_file = colored(json_rectangle_file, "yellow", attrs=['bold'])
-            datatype_hint = colored("! They are expected to be POSITIVE NUMBERS (greater than zero)", "red", attrs = ['bold'])
-            logger.error(f"CORRUPTED inputs are detected in {json_rectangle_file}{datatype_hint}\n")
+        if (None in [length, width]) and (self._quarantine_path != ""):
+            if file_problem is not None:
+                self._quarantine_records.append((str(json_file_path), None, "file", None, file_problem))
+            
+            else:
+                for field, raw_value, value in (("length", raw_length, length), ("width", raw_width, width)):
+                    if value is None:
+                        self._quarantine_records.append((str(json_file_path), None, field, raw_value, RectangleCalculator.__corruption_reason(raw_value)))
+        
+        elif (None in [length, width]) and (self._log_mode == "fast") and (self._json_count >= 2):
+            self._corrupted_files.append(str(json_rectangle_file)) # Reported once for the whole batch, not one colored line per file
+        
+        elif None in [length, width]:
+            with self._metrics.stage("log"):
+                json_rectangle_file = colored(json_rectangle_file, "yellow", attrs=['bold'])
+                datatype_hint = colored("! They are expected to be POSITIVE NUMBERS (greater than zero)", "red", attrs = ['bold'])
+                logger.error(f"CORRUPTED inputs are detected in {json_rectangle_file}{datatype_hint}\n")
         
         return length, width
     
 
     @property
     def perimeter(self):
-        if (None in [self.__length, self.__width]) and ((str(self._input) == "") or (not Path(self._input).is_dir())):
+        if (None in [self.__length, self.__width]) and (self.__preflight_paths() != "directory"):
             length, width = RectangleCalculator.__valiate_input_number(self.length, self.width)
         
         else:
@@ -161,7 +599,7 @@ class RectangleCalculator:
 
     @property
     def area(self):
-        if (None in [self.__length, self.__width]) and ((str(self._input) == "") or (not Path(self._input).is_dir())):
+        if (None in [self.__length, self.__width]) and (self.__preflight_paths() != "directory"):
             length, width = RectangleCalculator.__valiate_input_number(self.length, self.width)
         
         else:
@@ -183,17 +621,18 @@ class RectangleCalculator:
         else:
             length, width = self.length, self.width
         
-        result_dict = {
-            "length": length,
-            "width": width,
-            "perimeter": self.perimeter,
-            "area": self.area
-        }
+        with self._metrics.stage("compute"):
+            result_dict = {
+                "length": length,
+                "width": width,
+                "perimeter": self.perimeter,
+                "area": self.area
+            }
 
         if None in [self.__perimeter, self.__area]:
             return None # Don't save the file if its outputs are corrupted
        
-        with open(self._single_output_path, "w") as json_pointer:
+        with self._metrics.stage("write"), open(self._single_output_path, "w") as json_pointer:
             json.dump(result_dict, json_pointer, indent=4)
 
     
@@ -210,7 +649,7 @@ class RectangleCalculator:
         rectangle_output_name = colored(str(rectangle_output_name), (139, 0, 0), attrs=["bold"])
         prioritize_message = colored(", prioritize them for calculation.", "yellow", attrs=['bold'])
 
-        if (None in [self.__length, self.__width]) and ((str(self._input) == "") or (not Path(self._input).is_dir())):
+        if (None in [self.__length, self.__width]) and (self.__preflight_paths() != "directory"):
             length, width = self.length, self.width
         
         else:
@@ -238,13 +677,13 @@ class RectangleCalculator:
                     return None
                 
                 else:
-                    if (str(self._input) != "") and (Path(self._input).exists()) and (None not in [self.length, self.width, self.__length, self.__width]):
+                    if (self.__preflight_paths() != "missing") and (None not in [self.length, self.width, self.__length, self.__width]):
                         logger.warning(f"Detected valid inputs in {rectangle_output_name}{prioritize_message}\n")
                                         
                     return out_message # This will make thi message printed out when being imported, avoid showing twice
             
             case _:
-                if (str(self._input) != "") and (Path(self._input).exists()) and (None not in [self.length, self.width, self.__length, self.__width]):
+                if (self.__preflight_paths() != "missing") and (None not in [self.length, self.width, self.__length, self.__width]):
                     logger.warning(f"Detected valid inputs in {rectangle_output_name}{prioritize_message}\n")
                 
                 self.__save_output_file()
@@ -275,10 +714,12 @@ class RectangleCalculator:
             case _: # If the input JSON file is given, use its data for calculation
                 self.__length, self.__width = self.__load_rectangle_inputs(json_rectangle_file)    
 
-                if Path(self._input).is_dir() and (self._json_count >= 2):  
+                input_kind = self.__preflight_paths()
+
+                if (input_kind == "directory") and (self._json_count >= 2):  
                     self._single_output_path = self.__validate_output_file(json_rectangle_file)
                     
-                elif ((Path(self._input).is_dir()) and (self._json_count == 1)) or (Path(self._input).is_file()):
+                elif ((input_kind == "directory") and (self._json_count == 1)) or (input_kind == "file"):
                     if (None in [self.__length, self.__width]) and (None not in [self.length, self.width]):
                         logger.debug("Detected valid inputs given by -l (--length) and -w (--width), using them for calculation\n")
                         json_rectangle_file = "" # To avoid using the name of corrupted file in the summary()
@@ -292,110 +733,1723 @@ class RectangleCalculator:
                     self._single_output_path = self.__validate_output_file(self._output)
         
         
-        if str(json_rectangle_file).endswith(".json") and Path(self._input).exists() and (str(self._input) != ""):
+        if str(json_rectangle_file).endswith(".json") and (self.__preflight_paths() != "missing"):
             out_message = self.summary(Path(json_rectangle_file).name)
         
         else:
             out_message = self.summary()
         
         if out_message is not None:
-            logger.info(out_message)
+            with self._metrics.stage("log"):
+                logger.info(out_message)
+
+
+    def _chunk_workflow(self, json_rectangle_files):
+        '''
+        Run _single_workflow() on every JSON file name of a chunk,
+        then return the aggregated counts of the chunk instead of one result per file.
+
+        When all results go to one file, the chunk is computed with compute_batch() instead,
+        and its valid results are returned (as columns) to be written by the parent process.
+        '''
+        if (self._output_format != "json") and (str(self._output) != ""):
+            return self.__chunk_columns_workflow(json_rectangle_files)
+        
+        chunk_counts = {"processed": 0, "valid": 0, "corrupted": 0}
+
+        for json_rectangle_file in json_rectangle_files:
+            self._single_workflow(json_rectangle_file)
+            chunk_counts["processed"] += 1
+
+            if None in [self.__length, self.__width]:
+                chunk_counts["corrupted"] += 1
             
+            else:
+                chunk_counts["valid"] += 1
+        
+        if self._metrics.enabled:
+            chunk_counts["metrics"] = self._metrics.take_snapshot() # The timings of this chunk, merged by the parent process
+        
+        chunk_counts["corrupted_files"], self._corrupted_files = self._corrupted_files, []
+        chunk_counts["quarantine"], self._quarantine_records = self._quarantine_records, []
+        
+        return chunk_counts
 
-#------------------------------------------------------------------------------------------------------------#
-#------------------------------------------ Define log_file() function --------------------------------------#
-#------------------------------------------------------------------------------------------------------------#
 
-def __config_log_file(project_dir): # Internal use only, cannot call out when the module is being imported
-    logger_path = Path(project_dir).joinpath("rectangle_logs.txt")
-    if logger_path.exists():
-        logger_path.unlink() # Delete the rectangle_logs.txt of the previous run if existed
+    def __chunk_columns_workflow(self, json_rectangle_files): # Internal use only, cannot call out when the module is being imported
+        lengths, widths = [], []
 
-    logger.add(sink = logger_path, # The path to the .txt file that saves logs
-            rotation="1 MB",  # Rotate when file reaches 1MB
-            retention="10 days",  # Keep logs for 10 days
-            level="WARNING") # Only save the WARNING level and above
+        for json_rectangle_file in json_rectangle_files:
+            length, width = self.__load_rectangle_inputs(json_rectangle_file)
+            lengths.append(length)
+            widths.append(width)
+        
+        with self._metrics.stage("compute"):
+            lengths = np.array(lengths, dtype=np.float64) # None (corrupted) becomes NaN
+            widths = np.array(widths, dtype=np.float64)
+            batch = RectangleBatch.from_inputs(lengths, widths)
+            valid_count = int(batch.valid_mask.sum())
 
+        corrupted_files, self._corrupted_files = self._corrupted_files, []
+        quarantine_records, self._quarantine_records = self._quarantine_records, []
 
-#--------------------------------------------------------------------------------------------------------------#
-#------------------------------------------ Define parse_args() function --------------------------------------#
-#--------------------------------------------------------------------------------------------------------------#
+        return {
+            "metrics": self._metrics.take_snapshot() if self._metrics.enabled else None,
+            "corrupted_files": corrupted_files,
+            "quarantine": quarantine_records,
+            "processed": len(json_rectangle_files),
+            "valid": valid_count,
+            "corrupted": len(json_rectangle_files) - valid_count,
+            "results": batch.valid_columns("file", json_rectangle_files)
+        }
 
-def __parse_args():
-    formatter = lambda prog: HelpFormatter(prog, width=200, max_help_position=50)
 
-    parser = ArgumentParser(
-        prog = "Rectangle Calculator Program",
-        description = "Calculate the perimeter and area of a rectangle.",
-        add_help = True,
-        formatter_class = formatter
-    )
-    
-    parser.add_argument("-l", "--length", required=False, default=None, metavar="\b", help="Length of the rectangle (expected to be a positive number).")
-    parser.add_argument("-w", "--width", required=False, default=None, metavar="\b", help="Width of the rectangle (expected to be a positive number).")
-    parser.add_argument("-i", "--input", required=False, default="", metavar="\b", help="Input path leading to a JSON file containing the length and width of a rectangle, or to a directory having multiple JSON input files.")
-    parser.add_argument("-o", "--output", required=False, default="", metavar="\b", help="Output path leading to a JSON file to store the results, or to a directory to store multiple JSON output files.")
-    parser.add_argument("-c", "--cores", required=False, default=2, type=int, metavar="\b", help="The number of CPU cores to be used for parallel computing.")
+    def __save_json_result(self, json_rectangle_file, length, width, perimeter, area): # Internal use only, cannot call out when the module is being imported
+        result_dict = {
+            "length": length,
+            "width": width,
+            "perimeter": perimeter,
+            "area": area
+        }
 
-    return parser.parse_args()
+        with open(Path(self._output).joinpath(json_rectangle_file), "w") as json_pointer:
+            json.dump(result_dict, json_pointer, indent=4)
 
 
-#------------------------------------------------------------------------------------------------------------#
-#------------------------------------------ Define main() function ------------------------------------------#
-#------------------------------------------------------------------------------------------------------------#
+    def _async_workflow(self, json_rectangle_files, writer=None):
+        '''
+        Compute the JSON files in one process with an asyncio pipeline of three stages:
+        bounded concurrent reads -> vectorized compute of batches -> bounded writer queue.
+        
+        The queues between the stages are bounded, so slow writes hold back the readers (backpressure)
+        and the memory stays bounded, while reads, compute and writes of different files overlap.
+        '''
+        # The stages are timed here, in the event loop thread: the load / write threads get a disabled metrics object,
+        # so they never update the shared timings at the same time
+        metrics, self._metrics = self._metrics, RectangleMetrics(enabled=False)
 
-def main():
-    try:
-        # calculator = RectangleCalculator(
-        #     length = '2',
-        #     width = "3.5"
-        # )
-        # calculator._input = "02_Python_class_OOP/rectangle_project/data"
-        # calculator._output = ""
-        # calculator._cores = 2
+        try:
+            return asyncio.run(self.__async_pipeline(json_rectangle_files, writer, metrics))
+        
+        finally:
+            self._metrics = metrics
 
-        args = __parse_args()
 
-        calculator = RectangleCalculator(
-            length = args.length,
-            width = args.width
-        )
-        calculator._input = args.input
-        calculator._output = args.output
-        calculator._cores = args.cores
+    async def __async_pipeline(self, json_rectangle_files, writer, metrics): # Internal use only, cannot call out when the module is being imported
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=self._io_concurrency)) # Blocking file I/O runs in these threads
+        
+        record_queue = asyncio.Queue(maxsize=self._io_concurrency * 4)
+        result_queue = asyncio.Queue(maxsize=4)
+        file_iterator = iter(json_rectangle_files) # Shared by every reader, each one takes the next file name
+        async_counts = {"processed": 0, "valid": 0, "corrupted": 0}
 
-        if (calculator._input != "") and (Path(calculator._input).is_dir()):
-            calculator._input = Path(calculator._input)
-            
-            input_json_files = [(entry.name,) for entry in calculator._input.glob("*.json")]
-            calculator._json_count = len(input_json_files)
+        async def read_stage():
+            for json_rectangle_file in file_iterator:
+                with metrics.stage("load"): # Read and validate, the concurrent reads overlap: the total is larger than the wall time
+                    length, width = await asyncio.to_thread(self.__load_rectangle_inputs, json_rectangle_file)
+                await record_queue.put((json_rectangle_file, length, width)) # Wait here when the compute stage is behind
+        
+        async def compute_stage():
+            finished = False
+
+            while not finished:
+                batch = [await record_queue.get()]
+                while (len(batch) < RectangleCalculator._bulk_batch_size) and (not record_queue.empty()):
+                    batch.append(record_queue.get_nowait())
+                
+                if batch[-1] is None: # All readers are done
+                    batch.pop()
+                    finished = True
+                
+                if not batch:
+                    continue
+
+                with metrics.stage("compute"):
+                    names, lengths, widths = zip(*batch)
+                    lengths = np.array(lengths, dtype=np.float64) # None (corrupted) becomes NaN
+                    widths = np.array(widths, dtype=np.float64)
+                    rectangles = RectangleBatch.from_inputs(lengths, widths)
+
+                valid_count = int(rectangles.valid_mask.sum())
+                async_counts["processed"] += len(batch)
+                async_counts["valid"] += valid_count
+                async_counts["corrupted"] += len(batch) - valid_count
+
+                await result_queue.put(rectangles.valid_columns("file", names)) # Wait here when the write stage is behind
             
-            if calculator._json_count > 1:
-                calculator._output = calculator._RectangleCalculator__validate_output_directory()
+            await result_queue.put(None)
+        
+        async def save_rows(row_iterator):
+            for row in row_iterator:
+                await asyncio.to_thread(self.__save_json_result, *row)
 
-                match str(calculator._output):
-                    case "":
-                        logger.warning(
-                            (   
-                                "\nYou are passing multiple input files but no valid ouput directory path was given!!!"
-                                "\nIf you procced, all results will be displayed here WITHOUT being saved!!!"
-                            )
-                        )
-                        
-                        answer = input(colored("Would you like to proceed? [y/n]: ", "blue", attrs=["bold"]))
+        async def write_stage():
+            while (results := await result_queue.get()) is not None:
+                rows = zip(*(values.tolist() for values in results.values()))
 
-                        if answer.lower() == "y":
-                            with multiprocessing.Pool(processes=calculator._cores) as pool:
-                                pool.starmap(func=calculator._single_workflow, iterable=input_json_files)
-                        
-                        else:
-                            return None # stop the program
-                        
-                    case _:
-                        __config_log_file(calculator._input.parent) # Only produce rectangle_logs.txt if the input and output directories or files are given           
+                if writer is not None:
+                    with metrics.stage("write"):
+                        await asyncio.to_thread(writer.write_batch, results)
+                
+                elif str(self._output) != "": # At most io_concurrency JSON files are written at the same time
+                    with metrics.stage("write"):
+                        await asyncio.gather(*(save_rows(rows) for _ in range(self._io_concurrency)))
+                
+                else: # No output path was given, display the results like summary()
+                    with metrics.stage("log"):
+                        for name, length, width, perimeter, area in rows:
+                            rectangle_output_name = colored(name, (139, 0, 0), attrs=["bold"])
+                            perimeter_result = colored(f"++ Perimeter = 2 * ({length} + {width}) = {perimeter}", "cyan", attrs=["bold"])
+                            area_result = colored(f"++ Area = {length} * {width} = {area}", "cyan", attrs=["bold"])
+                            logger.info(f"\n\nResult of the {rectangle_output_name} rectangle:\n++ Length = {length}\n++ Width = {width}\n{perimeter_result}\n{area_result}\n")
+        
+        compute_task = asyncio.create_task(compute_stage())
+        write_task = asyncio.create_task(write_stage())
+
+        await asyncio.gather(*(read_stage() for _ in range(self._io_concurrency)))
+        await record_queue.put(None)
+        await asyncio.gather(compute_task, write_task)
+
+        metrics.add_counts(async_counts)
+        async_counts["corrupted_files"], self._corrupted_files = self._corrupted_files, []
+        logger.debug(f"Processed {async_counts['processed']} JSON files with the asyncio pipeline ({async_counts['valid']} valid, {async_counts['corrupted']} corrupted)\n")
+
+        return async_counts
+
+
+    def _bulk_workflow(self):
+        '''
+        Stream the rectangles of a bulk JSON Lines / CSV input file in batches,
+        compute each batch with compute_batch(), then append the valid results to one output file.
+        '''
+        bulk_counts = {"processed": 0, "valid": 0, "corrupted": 0}
+        self._single_output_path = self.__validate_results_file()
+        
+        records = RectangleCalculator._stream_bulk_inputs(self._input)
+        writer = None
+        if self._single_output_path is not None:
+            writer = RectangleResultWriter(self._single_output_path, self._results_file_format(), key_column="line")
+            writer.open()
+        input_file = colored(Path(self._input).name, "yellow", attrs=['bold'])
+        datatype_hint = colored("! They are expected to be POSITIVE NUMBERS (greater than zero)", "red", attrs = ['bold'])
+
+        try:
+            while batch := list(islice(records, RectangleCalculator._bulk_batch_size)):
+                line_numbers, lengths, widths, line_problems = zip(*batch)
+                rectangles = RectangleBatch.from_inputs( # fromiter keeps one raw value per slot, np.array() would turn lists into extra dimensions
+                    np.fromiter(lengths, dtype=object, count=len(lengths)), np.fromiter(widths, dtype=object, count=len(widths))
+                )
+
+                corrupted_lines = [line_numbers[idx] for idx in np.flatnonzero(~rectangles.valid_mask)]
+                bulk_counts["processed"] += len(batch)
+                bulk_counts["corrupted"] += len(corrupted_lines)
+                bulk_counts["valid"] += len(batch) - len(corrupted_lines)
+                
+                if corrupted_lines and (self._quarantine_path != ""):
+                    for idx in np.flatnonzero(~rectangles.valid_mask).tolist():
+                        if line_problems[idx] is not None: # The whole line is unreadable, not one of its values
+                            self._quarantine_records.append((str(self._input), line_numbers[idx], "line", None, line_problems[idx]))
+                            continue
+
+                        for field, raw_value in (("length", lengths[idx]), ("width", widths[idx])):
+                            if (reason := RectangleCalculator.__corruption_reason(raw_value)) is not None:
+                                self._quarantine_records.append((str(self._input), line_numbers[idx], field, raw_value, reason))
+                
+                elif corrupted_lines:
+                    shown_lines = ", ".join(str(line) for line in corrupted_lines[:10]) + (", ..." if len(corrupted_lines) > 10 else "")
+                    logger.error(f"CORRUPTED inputs are detected in {len(corrupted_lines)} records of {input_file} (lines {shown_lines}){datatype_hint}\n")
+
+                if writer is not None:
+                    writer.write_batch(rectangles.valid_columns("line", np.array(line_numbers, dtype=np.int64)))
+        
+        finally:
+            if writer is not None:
+                writer.close()
+
+        self._metrics.add_counts(bulk_counts)
+        logger.info(f"Processed {bulk_counts['processed']} rectangles from {input_file} ({bulk_counts['valid']} valid, {bulk_counts['corrupted']} corrupted)\n")
+
+        if writer is None:
+            self._output = "" # Nothing was saved, avoid displaying the log "The result is saved in None"
+            logger.warning("No output path was given, the results of the bulk input file are NOT saved!!!\n")
+
+        return bulk_counts
+            
+
+#------------------------------------------------------------------------------------------------------------#
+#--------------------------------------- Define the rectangle record classes --------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class Rectangle:
+    '''
+    A lightweight record of one rectangle, holding the data only (the run configuration stays in RectangleCalculator).
+    __slots__ removes the per-instance __dict__, so a record costs a few dozen bytes instead of hundreds.
+
+    length: the length of the rectangle (a valid positive number, or NaN if corrupted)
+    width: the width of the rectangle (a valid positive number, or NaN if corrupted)
+    '''
+    __slots__ = ("length", "width")
+
+    def __init__(self, length, width):
+        self.length = length
+        self.width = width
+
+
+    @property
+    def perimeter(self):
+        return 2 * (self.length + self.width)
+
+
+    @property
+    def area(self):
+        return self.length * self.width
+
+
+    def __repr__(self):
+        return f"Rectangle(length={self.length}, width={self.width})"
+
+
+class RectangleBatch:
+    '''
+    Many rectangles stored as one NumPy structured array (struct of arrays),
+    32 bytes per rectangle: length, width, perimeter and area as float64.
+    Corrupted rectangles are kept with NaN perimeter and area, see valid_mask.
+
+    records: a structured array with the RectangleBatch.fields (float64)
+    '''
+    __slots__ = ("records",)
+    fields = ("length", "width", "perimeter", "area")
+
+    def __init__(self, records):
+        self.records = records
+
+
+    @classmethod
+    def from_inputs(cls, lengths, widths):
+        '''
+        lengths: an array-like of raw lengths (numbers, strings, None...), validated like compute_batch()
+        widths: an array-like of raw widths, with the same length as lengths
+        '''
+        lengths, _ = RectangleCalculator._RectangleCalculator__to_float_array(lengths)
+        widths, _ = RectangleCalculator._RectangleCalculator__to_float_array(widths)
+        perimeters, areas, _ = RectangleCalculator.compute_batch(lengths, widths)
+
+        records = np.empty(len(lengths), dtype=[(field, np.float64) for field in cls.fields])
+        records["length"] = lengths
+        records["width"] = widths
+        records["perimeter"] = perimeters
+        records["area"] = areas
+
+        return cls(records)
+
+
+    @property
+    def valid_mask(self):
+        return ~np.isnan(self.records["perimeter"])
+
+
+    def valid_columns(self, key_column, keys):
+        '''
+        key_column: the name of the column identifying the rectangles (e.g. "file" or "line")
+        keys: the identifiers of the rectangles, in the same order as the records
+
+        return: the valid rectangles as a dictionary of columns, as expected by RectangleResultWriter.write_batch()
+        '''
+        valid_mask = self.valid_mask
+        columns = {key_column: np.asarray(keys)[valid_mask]}
+
+        for field in RectangleBatch.fields:
+            columns[field] = self.records[field][valid_mask]
+        
+        return columns
+
+
+    def __len__(self):
+        return len(self.records)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            record = self.records[index]
+            return Rectangle(float(record["length"]), float(record["width"]))
+        
+        return RectangleBatch(self.records[index]) # A slice or a mask gives another batch
+
+
+    def __repr__(self):
+        return f"RectangleBatch({len(self)} rectangles, {self.records.nbytes} bytes)"
+
+
+#------------------------------------------------------------------------------------------------------------#
+#---------------------------------------- Define the results writer class -----------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class RectangleResultWriter:
+    '''
+    This class buffers the results of many rectangles in the parent process,
+    then appends them batch by batch to one JSON Lines / CSV / Parquet / Arrow IPC file,
+    instead of writing one small JSON file per rectangle.
+    '''
+
+    _value_columns = ("length", "width", "perimeter", "area")
+
+
+    def __init__(self, output_file, output_format, key_column="file", buffer_rows=65536):
+        '''
+        output_file: the path to the single output file
+        output_format: "jsonl", "csv", "parquet" or "arrow" (Parquet and Arrow IPC require pyarrow)
+        key_column: the column identifying each rectangle, "file" (JSON file name) or "line" (line number of a bulk input file)
+        buffer_rows: the number of buffered rows that triggers a write to the output file
+        '''
+        self.output_file = Path(output_file)
+        self.output_format = output_format
+        self.key_column = key_column
+        self.buffer_rows = buffer_rows
+        self.rows_written = 0
+        self.__buffer = []
+        self.__buffered_rows = 0
+        self.__file_pointer = None
+        self.__table_writer = None
+
+
+    def __enter__(self):
+        self.open()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def open(self):
+        columns = (self.key_column, *RectangleResultWriter._value_columns)
+
+        match self.output_format:
+            case "jsonl":
+                self.__file_pointer = open(self.output_file, "w", buffering=1024 * 1024)
+            
+            case "csv":
+                self.__file_pointer = open(self.output_file, "w", newline="", buffering=1024 * 1024)
+                self.__table_writer = csv.writer(self.__file_pointer)
+                self.__table_writer.writerow(columns)
+            
+            case "parquet" | "arrow":
+                try:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                
+                except ImportError:
+                    raise ImportError(f'The "{self.output_format}" output format requires pyarrow, install it with "pip install pyarrow"')
+                
+                key_type = pa.string() if self.key_column == "file" else pa.int64()
+                self.__schema = pa.schema([(self.key_column, key_type)] + [(column, pa.float64()) for column in RectangleResultWriter._value_columns])
+
+                if self.output_format == "parquet":
+                    self.__table_writer = pq.ParquetWriter(self.output_file, self.__schema)
+                
+                else:
+                    self.__table_writer = pa.ipc.new_file(str(self.output_file), self.__schema)
+            
+            case _:
+                raise ValueError(f'Unknown output format "{self.output_format}", expected one of "jsonl", "csv", "parquet" or "arrow"')
+
+
+    def write_batch(self, results):
+        '''
+        results: a dictionary of equal-length arrays, with the key column and the "length", "width", "perimeter", "area" columns
+        '''
+        row_count = len(results[self.key_column])
+        if row_count == 0:
+            return None
+        
+        self.__buffer.append(results)
+        self.__buffered_rows += row_count
+
+        if self.__buffered_rows >= self.buffer_rows:
+            self.flush()
+
+
+    def flush(self):
+        if self.__buffered_rows == 0:
+            return None
+        
+        columns = {
+            column: np.concatenate([np.asarray(results[column]) for results in self.__buffer])
+            for column in (self.key_column, *RectangleResultWriter._value_columns)
+        }
+
+        match self.output_format:
+            case "jsonl":
+                self.__file_pointer.writelines(
+                    json.dumps(dict(zip(columns, row))) + "\n" for row in zip(*(values.tolist() for values in columns.values()))
+                )
+            
+            case "csv":
+                self.__table_writer.writerows(zip(*(values.tolist() for values in columns.values())))
+            
+            case "parquet" | "arrow":
+                import pyarrow as pa
+                self.__table_writer.write_table(pa.Table.from_pydict(columns, schema=self.__schema))
+        
+        self.rows_written += self.__buffered_rows
+        self.__buffer = []
+        self.__buffered_rows = 0
+
+
+    def close(self):
+        self.flush()
+
+        if self.output_format in ["parquet", "arrow"] and self.__table_writer is not None:
+            self.__table_writer.close()
+        
+        if self.__file_pointer is not None:
+            self.__file_pointer.close()
+        
+        self.__table_writer = None
+        self.__file_pointer = None
+
+
+#------------------------------------------------------------------------------------------------------------#
+#---------------------------------------- Define the progress log class -------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class RectangleProgressLog:
+    '''
+    This class appends the names of the input JSON files whose results are saved to a log file (one name per line),
+    so a killed run can be continued with --resume instead of starting again from zero.
+    '''
+
+    def __init__(self, progress_file, resume=False, sync_interval=1.0):
+        '''
+        progress_file: the path to the progress log, in the output directory
+        resume: keep the names recorded by the previous run (True), or start a new log (False)
+        sync_interval: the minimum number of seconds between two os.fsync() of the log (it is flushed after every chunk)
+        '''
+        self.progress_file = Path(progress_file)
+        self.resume = resume
+        self.sync_interval = sync_interval
+        self.completed_files = set()
+        self.__file_pointer = None
+        self.__last_sync = 0.0
+
+
+    def __enter__(self):
+        self.open()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def open(self):
+        if self.resume and self.progress_file.exists():
+            with open(self.progress_file, "r") as file_pointer:
+                lines = file_pointer.read().split("\n")
+            
+            self.completed_files = set(lines[:-1]) # The last piece is empty, or a name cut by the kill
+        
+        self.__file_pointer = open(self.progress_file, "a" if self.resume else "w")
+        
+        if self.resume and self.__file_pointer.tell() > 0:
+            self.__file_pointer.write("\n") # Close a line cut by the kill, an empty line is ignored later
+        
+        self.__last_sync = time.monotonic()
+
+
+    def record(self, json_rectangle_files):
+        self.__file_pointer.write("".join(f"{json_rectangle_file}\n" for json_rectangle_file in json_rectangle_files))
+        self.__file_pointer.flush() # Survives a killed process
+
+        if time.monotonic() - self.__last_sync >= self.sync_interval:
+            os.fsync(self.__file_pointer.fileno()) # Survives a lost machine, at most once per sync_interval
+            self.__last_sync = time.monotonic()
+
+
+    def close(self):
+        if self.__file_pointer is not None:
+            self.__file_pointer.flush()
+            os.fsync(self.__file_pointer.fileno())
+            self.__file_pointer.close()
+            self.__file_pointer = None
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------- Define the metrics class ---------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class _StageTimer:
+    __slots__ = ("timings", "stage_name", "start_ns")
+
+    def __init__(self, timings, stage_name):
+        self.timings = timings
+        self.stage_name = stage_name
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        calls_and_total = self.timings.setdefault(self.stage_name, [0, 0])
+        calls_and_total[0] += 1
+        calls_and_total[1] += time.perf_counter_ns() - self.start_ns
+
+
+class RectangleMetrics:
+    '''
+    This class collects per-stage timers (load, validate, compute, log, write) and file counters of the workflow.
+
+    Every worker process times its own stages, its timings are sent back with the results of each chunk,
+    then merged in the parent process into per-worker and overall totals.
+    When disabled, stage() returns a shared do-nothing context manager, so the hot path pays almost nothing.
+    '''
+
+    _disabled_stage = nullcontext()
+
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_ns = time.perf_counter_ns()
+        self.counts = {"processed": 0, "valid": 0, "corrupted": 0}
+        self.stages = {} # {stage: [calls, total_ns]} of every process, merged
+        self.workers = {} # {pid: {stage: [calls, total_ns]}}
+        self.__local_timings = {} # The timings of this process, not merged yet
+
+
+    def stage(self, stage_name):
+        if not self.enabled:
+            return RectangleMetrics._disabled_stage
+        
+        return _StageTimer(self.__local_timings, stage_name)
+
+
+    def take_snapshot(self):
+        snapshot = {"pid": os.getpid(), "stages": self.__local_timings}
+        self.__local_timings = {}
+        return snapshot
+
+
+    def merge(self, snapshot):
+        if not self.enabled:
+            return None
+        
+        worker_timings = self.workers.setdefault(str(snapshot["pid"]), {})
+
+        for stage_name, (calls, total_ns) in snapshot["stages"].items():
+            for timings in (self.stages, worker_timings):
+                calls_and_total = timings.setdefault(stage_name, [0, 0])
+                calls_and_total[0] += calls
+                calls_and_total[1] += total_ns
+
+
+    def add_counts(self, counts):
+        if not self.enabled:
+            return None
+        
+        for key in self.counts:
+            self.counts[key] += counts.get(key, 0)
+
+
+    def to_dict(self):
+        self.merge(self.take_snapshot()) # Timings of the parent process itself
+        stage_summary = lambda timings: {
+            stage_name: {"calls": calls, "total_seconds": total_ns / 1e9, "mean_microseconds": total_ns / calls / 1e3}
+            for stage_name, (calls, total_ns) in timings.items()
+        }
+
+        return {
+            "wall_seconds": (time.perf_counter_ns() - self.started_ns) / 1e9,
+            "files": self.counts,
+            "stages": stage_summary(self.stages),
+            "workers": {pid: stage_summary(timings) for pid, timings in self.workers.items()}
+        }
+
+
+    def to_prometheus(self):
+        metrics_dict = self.to_dict()
+        lines = [
+            "# HELP rectangle_wall_seconds Wall time of the rectangle run.",
+            "# TYPE rectangle_wall_seconds gauge",
+            f"rectangle_wall_seconds {metrics_dict['wall_seconds']}",
+            "# HELP rectangle_files_total Input files (or bulk records) by status.",
+            "# TYPE rectangle_files_total counter"
+        ]
+        lines += [f'rectangle_files_total{{status="{status}"}} {count}' for status, count in metrics_dict["files"].items()]
+        lines += [
+            "# HELP rectangle_stage_seconds_total Time spent in each stage of the workflow, per worker process.",
+            "# TYPE rectangle_stage_seconds_total counter"
+        ]
+        lines += [
+            f'rectangle_stage_seconds_total{{stage="{stage_name}",worker="{pid}"}} {summary["total_seconds"]}'
+            for pid, stages in metrics_dict["workers"].items() for stage_name, summary in stages.items()
+        ]
+        lines += [
+            "# HELP rectangle_stage_calls_total Number of times each stage of the workflow ran, per worker process.",
+            "# TYPE rectangle_stage_calls_total counter"
+        ]
+        lines += [
+            f'rectangle_stage_calls_total{{stage="{stage_name}",worker="{pid}"}} {summary["calls"]}'
+            for pid, stages in metrics_dict["workers"].items() for stage_name, summary in stages.items()
+        ]
+
+        return "\n".join(lines) + "\n"
+
+
+    def save(self, metrics_file):
+        '''
+        metrics_file: the path to the summary file, Prometheus text format if it ends with ".prom", JSON otherwise
+        '''
+        metrics_file = Path(metrics_file)
+        metrics_file.parent.mkdir(exist_ok=True, parents=True)
+
+        with open(metrics_file, "w") as file_pointer:
+            if metrics_file.suffix == ".prom":
+                file_pointer.write(self.to_prometheus())
+            
+            else:
+                json.dump(self.to_dict(), file_pointer, indent=4)
+
+
+#------------------------------------------------------------------------------------------------------------#
+#-------------------------------- Define chunked multiprocessing dispatch functions -------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+_worker_calculator = None # The calculator of each worker process, set only once by __init_worker()
+
+
+def __init_worker(calculator): # Internal use only, cannot call out when the module is being imported
+    global _worker_calculator
+    _worker_calculator = calculator # The calculator is pickled once per worker, not once per task
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C is handled by the parent process, which terminates the pool
+
+
+def _run_worker_chunk(indexed_chunk):
+    chunk_index, json_rectangle_files = indexed_chunk
+    return chunk_index, _worker_calculator._chunk_workflow(json_rectangle_files)
+
+
+def __auto_chunk_size(file_count, cores): # Internal use only, cannot call out when the module is being imported
+    chunk_size, remainder = divmod(file_count, cores * 4) # About 4 chunks per core, same heuristic as Pool.map()
+    if remainder:
+        chunk_size += 1
+    
+    return max(chunk_size, 1)
+
+
+def __open_executor(calculator): # Internal use only, cannot call out when the module is being imported
+    if calculator._cluster_address != "": # The chunks go to the worker nodes connected to this address
+        return RectangleClusterExecutor(calculator, __parse_address(calculator._cluster_address), calculator._cluster_authkey)
+    
+    if calculator._execution == "serial":
+        return _SerialExecutor(calculator)
+    
+    return multiprocessing.Pool(processes=calculator._cores, initializer=__init_worker, initargs=(calculator,))
+
+
+class _SerialExecutor:
+    '''
+    Run the chunks one by one in this process, with the same interface as the process pool,
+    for workloads that are done before a pool would even be started.
+    '''
+
+    def __init__(self, calculator):
+        self.calculator = calculator
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+    def imap_unordered(self, function, indexed_chunks):
+        for chunk_index, json_rectangle_files in indexed_chunks:
+            yield chunk_index, self.calculator._chunk_workflow(json_rectangle_files)
+
+
+def __usable_cores(): # Internal use only, cannot call out when the module is being imported
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) # The cores this process may run on (containers, taskset...), not all cores of the machine
+    
+    return os.cpu_count() or 1
+
+
+def __plan_execution(calculator, json_rectangle_files, sample_size=64): # Internal use only, cannot call out when the module is being imported
+    '''
+    Read a sample of the input files (without computing or writing anything) to measure the cost of one file,
+    then choose the execution, the number of workers and the chunk size of the whole run, and report the decision.
+    '''
+    file_count = len(json_rectangle_files)
+    if file_count == 0:
+        return None
+    
+    step = max(1, file_count // sample_size)
+    sample_files = json_rectangle_files[::step][:sample_size] # Spread over the whole list, not only its first files
+
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    for json_rectangle_file in sample_files:
+        try:
+            with open(calculator._input.joinpath(json_rectangle_file), "r") as json_pointer:
+                json.load(json_pointer)
+        
+        except (OSError, ValueError):
+            pass # A corrupted file costs about the same, it is reported by the real run
+    
+    wall_seconds, cpu_seconds = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    write_factor = 2 if calculator._output_format == "json" else 1 # One more small file is written per input, or only one row
+    file_seconds = write_factor * wall_seconds / len(sample_files)
+    cpu_ratio = cpu_seconds / wall_seconds if wall_seconds > 0 else 1.0
+    serial_seconds = file_seconds * file_count
+    usable_cores = __usable_cores()
+    
+    if calculator._async_io: # Asked explicitly, __dispatch_chunks() runs the asyncio pipeline whatever is chosen here
+        calculator._execution, calculator._cores = "thread", 1
+        reason = "--async-io was given"
+    
+    elif serial_seconds < RectangleCalculator._pool_startup_seconds:
+        calculator._execution, calculator._cores = "serial", 1
+        reason = "the whole run is cheaper than starting a process pool"
+    
+    elif cpu_ratio < 0.5: # Mostly waiting for the storage, threads overlap the reads better than processes
+        calculator._execution, calculator._cores = "thread", 1
+        calculator._async_io = True
+        reason = f"the inputs are I/O bound ({cpu_ratio:.0%} CPU)"
+    
+    elif usable_cores == 1:
+        calculator._execution, calculator._cores = "serial", 1
+        reason = "only one core is usable by this process"
+    
+    else:
+        workers = int(serial_seconds // RectangleCalculator._pool_startup_seconds) # Every worker must save more than its own startup
+        calculator._execution, calculator._cores = "process", max(2, min(usable_cores, workers))
+        reason = f"{usable_cores} usable cores"
+    
+    if (calculator._execution != "thread") and (calculator._chunk_size <= 0): # A chunk size given by -s (--chunk-size) is kept
+        chunk_size = max(1, round(RectangleCalculator._target_chunk_seconds / file_seconds)) if file_seconds > 0 else file_count
+        calculator._chunk_size = min(chunk_size, __auto_chunk_size(file_count, calculator._cores)) # Still about 4 chunks per worker
+    
+    logger.info(
+        f"Auto execution: {calculator._execution} with {calculator._cores} worker(s) and chunks of up to {calculator._chunk_size or 'auto'} files, "
+        f"because {reason} (sample of {len(sample_files)} files: {file_seconds * 1e6:.0f} us per file, about {serial_seconds:.2f} s serially)\n"
+    )
+
+
+def __log_corrupted_files(corrupted_files): # Internal use only, cannot call out when the module is being imported
+    if not corrupted_files:
+        return None # Nothing collected, either no corrupted file or the "full" log mode already logged them one by one
+    
+    # Lazy: the colored message is only built if a sink accepts the ERROR level
+    logger.opt(lazy=True).error(
+        "{} CORRUPTED input files were detected ({}){}\n",
+        lambda: len(corrupted_files),
+        lambda: colored(", ".join(sorted(corrupted_files)[:10]) + (", ..." if len(corrupted_files) > 10 else ""), "yellow", attrs=['bold']),
+        lambda: colored("! They are expected to be POSITIVE NUMBERS (greater than zero)", "red", attrs = ['bold'])
+    )
+
+
+def __dispatch_chunks(calculator, json_rectangle_files, writer=None, pool=None, progress_log=None): # Internal use only, cannot call out when the module is being imported
+    calculator._RectangleCalculator__preflight_paths() # Resolved once here, then pickled to every worker with the calculator
+
+    if calculator._auto_execution and (pool is None) and (calculator._cluster_address == ""):
+        __plan_execution(calculator, json_rectangle_files)
+
+    chunk_size = calculator._chunk_size
+    if chunk_size <= 0:
+        chunk_size = __auto_chunk_size(len(json_rectangle_files), calculator._cores)
+    
+    chunks = [json_rectangle_files[start:start + chunk_size] for start in range(0, len(json_rectangle_files), chunk_size)]
+
+    if calculator._async_io and (pool is None) and (calculator._cluster_address == ""): # One process overlapping I/O and compute, no pool at all
+        if progress_log is None:
+            chunks = [json_rectangle_files] # No checkpoint needed, one pipeline for all files
+        
+        total_counts = {"processed": 0, "valid": 0, "corrupted": 0}
+        corrupted_files = []
+
+        for chunk in chunks:
+            chunk_counts = calculator._async_workflow(chunk, writer)
+            corrupted_files.extend(chunk_counts.pop("corrupted_files"))
+
+            if progress_log is not None:
+                progress_log.record(chunk)
+            
+            for key, count in chunk_counts.items():
+                total_counts[key] += count
+        
+        __log_corrupted_files(corrupted_files)
+        return total_counts
+    
+    if pool is None:
+        with __open_executor(calculator) as pool:
+            return __dispatch_chunks(calculator, json_rectangle_files, writer, pool, progress_log)
+    
+    total_counts = {"processed": 0, "valid": 0, "corrupted": 0}
+    corrupted_files = []
+
+    for chunk_index, chunk_counts in pool.imap_unordered(_run_worker_chunk, enumerate(chunks)):
+        if progress_log is not None:
+            progress_log.record(chunks[chunk_index]) # The results of this chunk are saved by now
+        
+        chunk_results = chunk_counts.pop("results", None)
+        chunk_metrics = chunk_counts.pop("metrics", None)
+        corrupted_files.extend(chunk_counts.pop("corrupted_files", []))
+        calculator._quarantine_records.extend(chunk_counts.pop("quarantine", [])) # Saved once at the end of the run
+
+        if (writer is not None) and (chunk_results is not None):
+            with calculator._metrics.stage("write"):
+                writer.write_batch(chunk_results) # Only the parent process writes, workers never touch the output file
+        
+        if chunk_metrics is not None:
+            calculator._metrics.merge(chunk_metrics)
+        
+        for key, count in chunk_counts.items():
+            total_counts[key] += count
+    
+    calculator._metrics.add_counts(total_counts)
+    __log_corrupted_files(corrupted_files)
+    logger.debug(f"Processed {total_counts['processed']} JSON files in {len(chunks)} chunks of up to {chunk_size} files ({total_counts['valid']} valid, {total_counts['corrupted']} corrupted)\n")
+
+    return total_counts
+
+
+#------------------------------------------------------------------------------------------------------------#
+#-------------------------------------- Define the multi-node work-queue executor ---------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class _ChunkDispatcher:
+    '''
+    The coordinator side of the cluster work queue: it hands the chunks out to the worker processes with a lease.
+    A chunk whose counts are not back before the end of its lease (e.g. its worker node was killed) is handed out again,
+    a late result of a chunk already finished by another worker is ignored.
+    '''
+
+    def __init__(self, lease_seconds):
+        from collections import deque
+
+        self.lease_seconds = lease_seconds
+        self.__condition = threading.Condition()
+        self.__waiting = deque() # Chunks not handed out yet, or handed out again
+        self.__leases = {} # {chunk_index: (indexed_chunk, deadline)} of the chunks being computed
+        self.__finished = set()
+        self.__closed = False
+
+
+    def put(self, indexed_chunk):
+        with self.__condition:
+            self.__waiting.append(indexed_chunk)
+            self.__condition.notify()
+
+
+    def take(self):
+        '''
+        Called by the worker processes (through a proxy): return the next chunk, or None once the coordinator has closed the run.
+        '''
+        with self.__condition:
+            while not self.__closed:
+                while self.__waiting:
+                    indexed_chunk = self.__waiting.popleft()
+
+                    if indexed_chunk[0] not in self.__finished: # Handed out again, but finished by its first worker in the meantime
+                        self.__leases[indexed_chunk[0]] = (indexed_chunk, time.monotonic() + self.lease_seconds)
+                        return indexed_chunk
+                
+                self.__condition.wait()
+            
+            return None
+
+
+    def finish(self, chunk_index):
+        '''
+        Release the lease of a chunk, return False if the chunk was already finished (a duplicate result).
+        '''
+        with self.__condition:
+            self.__leases.pop(chunk_index, None)
+            if chunk_index in self.__finished:
+                return False
+            
+            self.__finished.add(chunk_index)
+            return True
+
+
+    def requeue_expired(self):
+        '''
+        Hand out again the chunks whose lease has ended, return their indexes.
+        '''
+        with self.__condition:
+            now = time.monotonic()
+            expired_indexes = [chunk_index for chunk_index, (_, deadline) in self.__leases.items() if deadline <= now]
+
+            for chunk_index in expired_indexes:
+                self.__waiting.append(self.__leases.pop(chunk_index)[0])
+            
+            if expired_indexes:
+                self.__condition.notify_all()
+            
+            return expired_indexes
+
+
+    def leased_count(self):
+        # The number of chunks being computed by the worker processes right now
+        with self.__condition:
+            return len(self.__leases)
+
+
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all() # Every waiting worker process gets None
+
+
+def _queue_manager_class(dispatcher=None, result_queue=None, calculator=None):
+    '''
+    Return a manager class sharing the chunk dispatcher, the result queue and the calculator (the run configuration) over TCP,
+    the coordinator gives the objects to serve, the worker nodes only give nothing to connect to them.
+    '''
+    from multiprocessing.managers import BaseManager
+
+    class RectangleQueueManager(BaseManager):
+        pass
+
+    RectangleQueueManager.register("get_dispatcher", callable=None if dispatcher is None else (lambda: dispatcher))
+    RectangleQueueManager.register("get_result_queue", callable=None if result_queue is None else (lambda: result_queue))
+    RectangleQueueManager.register("get_calculator", callable=None if calculator is None else (lambda: calculator))
+
+    return RectangleQueueManager
+
+
+class RectangleClusterExecutor:
+    '''
+    This class sends the chunks of input JSON files to worker processes on other hosts (or on this host),
+    through a task queue served over TCP, and streams their counts and results back through a result queue.
+    It replaces the local process pool: __dispatch_chunks() only calls its imap_unordered().
+
+    Every chunk is leased to the worker process computing it: if its counts are not back within lease_seconds
+    (e.g. the worker node was killed), the chunk is handed out again to another worker.
+
+    Every host must see the input and output directories at the same paths (e.g. a shared NFS mount).
+    The queues are pickled over the network: only use it on a trusted network, with a secret authkey.
+    A worker node is started with: python rectangle_module.py --worker HOST:PORT --authkey KEY -c CORES
+    '''
+
+    _lease_seconds = 300.0 # Longer than any chunk should take, a slower chunk is only computed twice
+    _idle_warning_seconds = 30.0 # Warn when no worker node has taken a chunk for this long, e.g. none is started
+
+
+    def __init__(self, calculator, address, authkey, lease_seconds=None):
+        '''
+        calculator: the configured RectangleCalculator, sent once to every worker process
+        address: the (host, port) to listen on, port 0 picks a free port
+        authkey: the shared secret (bytes) of the coordinator and its worker nodes
+        lease_seconds: the time given to a worker to send the counts of a chunk back, before it is handed out again
+        '''
+        self.calculator = calculator
+        self.address = address
+        self.authkey = authkey
+        self.lease_seconds = lease_seconds or RectangleClusterExecutor._lease_seconds
+        self.__dispatcher = None
+        self.__result_queue = queue.Queue()
+        self.__server = None
+        self.__accepter = None
+        self.__stopping = None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+    def start(self):
+        self.__dispatcher = _ChunkDispatcher(self.lease_seconds)
+        manager_class = _queue_manager_class(self.__dispatcher, self.__result_queue, self.calculator)
+        self.__server = manager_class(address=self.address, authkey=self.authkey).get_server()
+        self.__server.stop_event = threading.Event()
+        self.address = self.__server.address # The real port, if port 0 was given
+        
+        self.__stopping = threading.Event()
+        self.__accepter = threading.Thread(target=self.__accept_workers, daemon=True)
+        self.__accepter.start()
+
+        cluster_address = colored(f"{self.address[0]}:{self.address[1]}", (139, 0, 0), attrs=["bold"])
+        logger.info(f"Serving the chunks of input files to the worker nodes on {cluster_address}\n")
+
+
+    def imap_unordered(self, function, indexed_chunks):
+        '''
+        Same role as multiprocessing.Pool.imap_unordered(), the worker nodes always run _run_worker_chunk(),
+        yield (chunk_index, chunk_counts) in the order the chunks are finished.
+        '''
+        remaining_chunks = set()
+        for indexed_chunk in indexed_chunks:
+            self.__dispatcher.put(indexed_chunk)
+            remaining_chunks.add(indexed_chunk[0])
+        
+        last_activity = time.monotonic()
+        while remaining_chunks:
+            for chunk_index in self.__dispatcher.requeue_expired():
+                logger.warning(f"The chunk {chunk_index} was not finished within {self.lease_seconds} seconds (worker node lost?), it is handed out again\n")
+
+            try:
+                chunk_index, chunk_counts = self.__result_queue.get(timeout=1) # Wait for any worker node
+            
+            except queue.Empty:
+                if self.__dispatcher.leased_count() > 0: # Some worker is computing a chunk
+                    last_activity = time.monotonic()
+                
+                elif time.monotonic() - last_activity >= RectangleClusterExecutor._idle_warning_seconds:
+                    cluster_address = colored(f"{self.address[0]}:{self.address[1]}", (139, 0, 0), attrs=["bold"])
+                    logger.warning(f"No worker node has taken a chunk for {RectangleClusterExecutor._idle_warning_seconds:.0f} seconds, {len(remaining_chunks)} chunks are waiting: start one with --worker {cluster_address}\n")
+                    last_activity = time.monotonic() # Repeated every _idle_warning_seconds, until a worker node connects
+                
+                continue
+            
+            last_activity = time.monotonic()
+            
+            if not self.__dispatcher.finish(chunk_index): # Already finished by another worker
+                continue
+            
+            remaining_chunks.discard(chunk_index)
+
+            if "error" in chunk_counts:
+                logger.error(f"A worker node failed on the chunk {chunk_index}: {chunk_counts['error']}\n")
+                continue # Not recorded in the progress log, computed again by --resume
+
+            yield chunk_index, chunk_counts
+
+
+    def __accept_workers(self): # Internal use only, cannot call out when the module is being imported
+        # Same as the accept loop of the manager server, but it can be stopped (the server of multiprocessing only stops with its process)
+        while not self.__stopping.is_set():
+            try:
+                connection = self.__server.listener.accept()
+            
+            except Exception: # A client with a wrong authkey, or the wake-up connection of stop()
+                continue
+            
+            if self.__stopping.is_set():
+                connection.close()
+                break
+            
+            threading.Thread(target=self.__server.handle_request, args=(connection,), daemon=True).start()
+
+
+    def stop(self):
+        if self.__server is None:
+            return None
+        
+        import socket
+
+        self.__dispatcher.close() # The worker processes get None, leave this run and wait for the next coordinator
+        self.__stopping.set()
+
+        try: # Wake up the accept loop
+            socket.create_connection(("127.0.0.1" if self.address[0] in ("", "0.0.0.0") else self.address[0], self.address[1]), timeout=1).close()
+        
+        except OSError:
+            pass
+        
+        self.__accepter.join(timeout=5)
+        self.__server.listener.close() # No new worker can connect anymore
+        self.__server = None
+
+
+def __parse_address(address): # Internal use only, cannot call out when the module is being imported
+    host, _, port = str(address).rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def __cluster_authkey(address, authkey): # Internal use only, cannot call out when the module is being imported
+    '''
+    Return the authkey (bytes) of a cluster address, or None if it is not safe to start:
+    the manager traffic is pickled, anybody knowing the key can run code on the coordinator and on the worker nodes,
+    so the well-known default key is only allowed on a loopback address.
+    '''
+    if authkey != "":
+        return authkey.encode()
+    
+    import ipaddress
+
+    try:
+        is_loopback = (address[0] == "localhost") or ipaddress.ip_address(address[0]).is_loopback
+    
+    except ValueError: # A host name
+        is_loopback = False
+    
+    if not is_loopback:
+        cluster_address = colored(f"{address[0]}:{address[1]}", (139, 0, 0), attrs=["bold"])
+        logger.critical(f"{cluster_address} is not a loopback address: give a secret key with --authkey or the RECTANGLE_AUTHKEY environment variable!")
+        print()
+        return None
+    
+    return b"rectangle"
+
+
+def _run_cluster_worker(address, authkey):
+    '''
+    One worker process of a worker node: take the chunks from the dispatcher of the coordinator,
+    compute them and put their counts (and results) into the result queue, forever.
+    When the coordinator is gone, wait and connect again to the next run.
+    '''
+    from multiprocessing.managers import BaseProxy
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C is handled by the worker node, which terminates its processes
+    waiting_logged = False
+
+    while True:
+        try:
+            # The proxies share one cached connection per address and thread: the one of the previous coordinator is dead,
+            # the proxies of the next run must open a new one
+            BaseProxy._address_to_local.pop(address, None)
+
+            manager = _queue_manager_class()(address=address, authkey=authkey)
+            manager.connect()
+            
+            dispatcher, result_queue = manager.get_dispatcher(), manager.get_result_queue()
+            __init_worker(manager.get_calculator()._getvalue()) # A local copy of the run configuration
+            waiting_logged = False
+
+            while (indexed_chunk := dispatcher.take()) is not None: # None when the coordinator closes its run
+                try:
+                    chunk_result = _run_worker_chunk(indexed_chunk)
+                
+                except Exception as e: # Reported to the coordinator, the worker keeps running
+                    chunk_result = (indexed_chunk[0], {"error": f"{type(e).__name__}: {e}"})
+                
+                result_queue.put(chunk_result)
+            
+            time.sleep(1) # Let the finished coordinator exit before connecting again
+        
+        except (EOFError, OSError): # No coordinator yet, or the coordinator process is gone (killed, or exited during a take())
+            if not waiting_logged:
+                logger.info(f"Waiting for a coordinator on {address[0]}:{address[1]}\n")
+                waiting_logged = True
+            
+            time.sleep(1)
+
+
+def __run_cluster_worker_node(address, authkey, cores): # Internal use only, cannot call out when the module is being imported
+    worker_processes = [multiprocessing.Process(target=_run_cluster_worker, args=(address, authkey), daemon=True) for _ in range(cores)]
+
+    for worker_process in worker_processes:
+        worker_process.start()
+    
+    logger.info(f"Started a worker node with {cores} processes, press Ctrl+C to stop\n")
+
+    try:
+        for worker_process in worker_processes:
+            worker_process.join()
+    
+    except KeyboardInterrupt:
+        for worker_process in worker_processes:
+            worker_process.terminate()
+        
+        logger.info("Stopped the worker node\n")
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define the request server class ---------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+class RectangleServer:
+    '''
+    This class keeps a warm process answering rectangle requests over a Unix socket or a localhost TCP port,
+    instead of starting the CLI for every rectangle.
+
+    Protocol: one JSON request per line, one JSON response per line, in the same order (requests can be pipelined).
+    A request is a rectangle {"length": ..., "width": ...} (an optional "id" is sent back), or a list of rectangles.
+    The requests of all clients waiting at the same time are computed together by one RectangleBatch (micro-batching).
+    '''
+
+    _error_message = "CORRUPTED inputs! They are expected to be POSITIVE NUMBERS (greater than zero)"
+    _overflow_message = "The perimeter or the area is too large to be computed"
+
+
+    def __init__(self, address, max_batch_size=65536):
+        '''
+        address: the path of a Unix socket, or "HOST:PORT" of a TCP port (e.g. 127.0.0.1:8765)
+        max_batch_size: the maximum number of waiting requests computed at once
+        '''
+        self.address = str(address)
+        self.max_batch_size = max_batch_size
+        self.requests_served = 0
+        self.__request_queue = None
+
+
+    def serve_forever(self):
+        host, _, port = self.address.rpartition(":")
+        is_unix_socket = not port.isdigit()
+
+        try:
+            asyncio.run(self.__serve(host, port, is_unix_socket))
+        
+        except KeyboardInterrupt:
+            logger.info(f"Stopped the rectangle server after {self.requests_served} requests\n")
+        
+        finally:
+            if is_unix_socket:
+                Path(self.address).unlink(missing_ok=True)
+
+
+    async def __serve(self, host, port, is_unix_socket): # Internal use only, cannot call out when the module is being imported
+        self.__request_queue = asyncio.Queue()
+        batch_task = asyncio.create_task(self.__compute_batches())
+
+        if is_unix_socket:
+            Path(self.address).unlink(missing_ok=True) # A socket file left by a killed server
+            server = await asyncio.start_unix_server(self.__handle_client, self.address, limit=2**26)
+        
+        else:
+            server = await asyncio.start_server(self.__handle_client, host or "127.0.0.1", int(port), limit=2**26)
+        
+        server_address = colored(self.address, (139, 0, 0), attrs=["bold"])
+        logger.info(f"Serving rectangle requests on {server_address}, press Ctrl+C to stop\n")
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), batch_task)
+
+
+    async def __handle_client(self, reader, writer): # Internal use only, cannot call out when the module is being imported
+        loop = asyncio.get_running_loop()
+        pending_responses = asyncio.Queue() # The futures of this client, in the order of its requests
+
+        async def send_responses():
+            while (response_future := await pending_responses.get()) is not None:
+                writer.write(await response_future)
+                
+                if pending_responses.empty(): # Flush once per burst of pipelined requests, not once per response
+                    await writer.drain()
+        
+        sender_task = asyncio.create_task(send_responses())
+
+        try:
+            async for line in reader:
+                if line.strip() == b"":
+                    continue
+
+                response_future = loop.create_future()
+                self.__request_queue.put_nowait((line, response_future))
+                pending_responses.put_nowait(response_future)
+        
+        except ConnectionError:
+            pass # The client is gone, its remaining responses are dropped
+        
+        finally:
+            pending_responses.put_nowait(None)
+            
+            try:
+                await sender_task
+                writer.close()
+            
+            except ConnectionError:
+                pass
+
+
+    async def __compute_batches(self): # Internal use only, cannot call out when the module is being imported
+        while True:
+            requests = [await self.__request_queue.get()]
+            while (len(requests) < self.max_batch_size) and (not self.__request_queue.empty()):
+                requests.append(self.__request_queue.get_nowait()) # Every request waiting right now joins the batch
+            
+            try:
+                self.__answer_batch(requests)
+            
+            except Exception as e: # One bad micro-batch must not stop the server, its clients get an error and can retry
+                logger.opt(exception=e).error("A batch of requests failed\n")
+
+                for _, response_future in requests:
+                    if not response_future.done():
+                        response_future.set_result(b'{"error": "The server failed to compute this request"}\n')
+
+
+    @staticmethod
+    def __parse_finite_float(text): # Internal use only, cannot call out when the module is being imported
+        number = float(text)
+        return number if math.isfinite(number) else text # 1e400 is kept as its text, echoing infinity would not be valid JSON
+
+
+    def __answer_batch(self, requests): # Internal use only, cannot call out when the module is being imported
+        parsed_requests = []
+        for line, response_future in requests:
+            try: # NaN / Infinity are kept as strings: rejected like any other string, and echoed back as valid JSON
+                request = json.loads(line, parse_constant=str, parse_float=RectangleServer.__parse_finite_float)
+            
+            except (ValueError, RecursionError): # RecursionError: e.g. a line of 100000 nested "["
+                response_future.set_result(b'{"error": "The request is not a valid JSON line"}\n')
+                continue
+
+            records = request if isinstance(request, list) else [request]
+            records = [record if isinstance(record, dict) else {} for record in records]
+            parsed_requests.append((response_future, isinstance(request, list), records))
+        
+        if not parsed_requests:
+            return None
+
+        all_records = [record for _, _, records in parsed_requests for record in records]
+        rectangles = RectangleBatch.from_inputs( # fromiter keeps one raw value per slot, even if a value is a list
+            np.fromiter((record.get("length") for record in all_records), dtype=object, count=len(all_records)),
+            np.fromiter((record.get("width") for record in all_records), dtype=object, count=len(all_records))
+        )
+        columns = {field: rectangles.records[field].tolist() for field in RectangleBatch.fields}
+        valid_mask = rectangles.valid_mask.tolist()
+        finite_mask = (np.isfinite(rectangles.records["perimeter"]) & np.isfinite(rectangles.records["area"])).tolist() # e.g. 1e200 * 1e200
+
+        position = 0
+        for response_future, is_list, records in parsed_requests:
+            responses = []
+            
+            for record in records:
+                if valid_mask[position] and finite_mask[position]:
+                    response = {field: columns[field][position] for field in RectangleBatch.fields}
+                
+                else:
+                    error_message = RectangleServer._overflow_message if valid_mask[position] else RectangleServer._error_message
+                    response = {"length": record.get("length"), "width": record.get("width"), "error": error_message}
+                
+                if "id" in record:
+                    response = {"id": record["id"], **response}
+                
+                responses.append(response)
+                position += 1
+            
+            if not response_future.done(): # Not cancelled by a disconnected client
+                response_future.set_result((json.dumps(responses if is_list else responses[0], allow_nan=False) + "\n").encode())
+        
+        self.requests_served += len(all_records)
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define watch mode functions -------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def __scan_json_signatures(input_dir): # Internal use only, cannot call out when the module is being imported
+    signatures = {}
+
+    with os.scandir(input_dir) as entries: # One directory read, no extra stat() call per file on most filesystems
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    
+    return signatures
+
+
+def __watch_directory(calculator, writer=None): # Internal use only, cannot call out when the module is being imported
+    '''
+    Keep a warm process pool and scan the input directory every poll_interval seconds,
+    every new or changed JSON file is computed right away and its result is written immediately.
+    Stop with Ctrl+C.
+    '''
+    seen_signatures = {}
+    manifest = None
+
+    if calculator._incremental and (writer is None): # Start from the manifest of the previous run, skip the unchanged files
+        changed_json_files, manifest = calculator._RectangleCalculator__plan_incremental_run(list(__scan_json_signatures(calculator._input)))
+        seen_signatures = {name: (entry["size"], entry["mtime_ns"]) for name, entry in manifest.items() if name not in changed_json_files}
+
+    calculator._RectangleCalculator__preflight_paths()
+    input_dir = colored(str(calculator._input), (139, 0, 0), attrs=["bold"])
+    logger.info(f"Watching {input_dir} for new JSON files every {calculator._poll_interval} seconds, press Ctrl+C to stop\n")
+
+    with __open_executor(calculator) as pool:
+        try:
+            while True:
+                current_signatures = __scan_json_signatures(calculator._input)
+                new_json_files = [name for name, signature in current_signatures.items() if seen_signatures.get(name) != signature]
+
+                if not new_json_files:
+                    time.sleep(calculator._poll_interval)
+                    continue
+
+                seen_signatures.update((name, current_signatures[name]) for name in new_json_files)
+
+                if writer is None: # Like the incremental mode: a rewritten file that is now corrupted must not keep its old result
+                    for name in new_json_files:
+                        Path(calculator._output).joinpath(name).unlink(missing_ok=True)
+
+                watch_counts = __dispatch_chunks(calculator, new_json_files, writer, pool)
+
+                if writer is not None:
+                    writer.flush() # Results are written as soon as they are computed, not at the end of the run
+                
+                logger.info(f"Computed {watch_counts['processed']} new or changed JSON files ({watch_counts['valid']} valid, {watch_counts['corrupted']} corrupted)\n")
+        
+        except KeyboardInterrupt:
+            logger.info("Stopped watching the input directory\n")
+        
+        finally:
+            if manifest is not None:
+                for name, (size, mtime_ns) in seen_signatures.items():
+                    if (name not in manifest) or ((manifest[name]["size"], manifest[name]["mtime_ns"]) != (size, mtime_ns)):
+                        try:
+                            stat = calculator._input.joinpath(name).stat()
+                            digest = RectangleCalculator._RectangleCalculator__file_digest(calculator._input.joinpath(name))
+                        
+                        except FileNotFoundError: # Deleted while watching
+                            manifest.pop(name, None)
+                            continue
+                        
+                        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns): # Changed after its last computation: no digest, computed again next run
+                            digest = None
+                        
+                        manifest[name] = {"size": size, "mtime_ns": mtime_ns, "digest": digest}
+                
+                calculator._RectangleCalculator__save_manifest(manifest)
+
+
+def __run_watch_mode(calculator): # Internal use only, cannot call out when the module is being imported
+    if str(calculator._output) == "":
+        logger.critical("The watch mode needs an output path (-o, --output) to save the results of the new JSON files!")
+        print()
+        return None
+    
+    calculator._json_count = max(calculator._json_count, 2) # The watched directory is always treated as a multi-file input
+
+    if calculator._output_format != "json":
+        results_file = calculator._RectangleCalculator__validate_results_file()
+
+        with RectangleResultWriter(results_file, calculator._output_format) as writer:
+            __watch_directory(calculator, writer)
+    
+    else:
+        calculator._output = calculator._RectangleCalculator__validate_output_directory()
+        __watch_directory(calculator)
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define log_file() function --------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def __config_log_file(project_dir, enqueue=False): # Internal use only, cannot call out when the module is being imported
+    logger_path = Path(project_dir).joinpath("rectangle_logs.txt")
+    if logger_path.exists():
+        logger_path.unlink() # Delete the rectangle_logs.txt of the previous run if existed
+
+    logger.add(sink = logger_path, # The path to the .txt file that saves logs
+            rotation="1 MB",  # Rotate when file reaches 1MB
+            retention="10 days",  # Keep logs for 10 days
+            level="WARNING", # Only save the WARNING level and above
+            enqueue=enqueue) # Written by a background thread of the parent process, workers never block on the file
+
+
+def __config_fast_logging(): # Internal use only, cannot call out when the module is being imported
+    logger.remove() # Replace the default (synchronous) stderr sink
+    logger.add(sink=sys.stderr, level="DEBUG", enqueue=True) # Must be added before the process pool is created
+
+
+#--------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define parse_args() function --------------------------------------#
+#--------------------------------------------------------------------------------------------------------------#
+
+def __parse_args():
+    from argparse import ArgumentParser, HelpFormatter # Only the full program needs it, not the -l/-w fast path
+
+    formatter = lambda prog: HelpFormatter(prog, width=200, max_help_position=50)
+
+    parser = ArgumentParser(
+        prog = "Rectangle Calculator Program",
+        description = "Calculate the perimeter and area of a rectangle.",
+        add_help = True,
+        formatter_class = formatter
+    )
+    
+    parser.add_argument("-l", "--length", required=False, default=None, metavar="\b", help="Length of the rectangle (expected to be a positive number).")
+    parser.add_argument("-w", "--width", required=False, default=None, metavar="\b", help="Width of the rectangle (expected to be a positive number).")
+    parser.add_argument("-i", "--input", required=False, default="", metavar="\b", help="Input path leading to a JSON file containing the length and width of a rectangle, to a directory having multiple JSON input files, or to a bulk JSON Lines (.jsonl) / CSV (.csv) file with one rectangle per line.")
+    parser.add_argument("-o", "--output", required=False, default="", metavar="\b", help="Output path leading to a JSON file to store the results, or to a directory to store multiple JSON output files.")
+    def cores(value):
+        return value if value == "auto" else int(value)
+    
+    parser.add_argument("-c", "--cores", required=False, default=2, type=cores, metavar="\b", help='The number of CPU cores to be used for parallel computing, or "auto" to measure a sample of the inputs and choose the execution, the cores and the chunk size.')
+    parser.add_argument("-f", "--output-format", required=False, default="json", choices=list(RectangleCalculator._output_formats), metavar="\b", help='Format of the results of multiple inputs: "json" (default) saves one JSON file per rectangle, "jsonl", "csv", "parquet" or "arrow" saves all results in one file.')
+    parser.add_argument("--incremental", required=False, action="store_true", help="Only compute the new or changed input JSON files of a directory, keep the results of the unchanged ones in the output directory.")
+    parser.add_argument("--resume", required=False, action="store_true", help='Continue an interrupted run: keep the output directory and skip the input JSON files recorded in its progress log (.rectangle_progress.log), "json" output format only.')
+    parser.add_argument("--watch", required=False, action="store_true", help="Keep running and compute every new or changed JSON file dropped into the input directory (stop with Ctrl+C).")
+    parser.add_argument("--poll-interval", required=False, default=0.1, type=float, metavar="\b", help="The number of seconds between two scans of the watched input directory (default: 0.1).")
+    parser.add_argument("--async-io", required=False, action="store_true", help="Compute the JSON files of a directory with an asyncio pipeline (overlapped reads, compute and writes in one process) instead of a process pool.")
+    parser.add_argument("--io-concurrency", required=False, default=64, type=int, metavar="\b", help="The maximum number of JSON files read (or written) at the same time by the asyncio pipeline (default: 64).")
+    parser.add_argument("-m", "--metrics", required=False, default="", metavar="\b", help='Enable the per-stage timers and counters, and save their summary to this file (Prometheus text format if it ends with ".prom", JSON otherwise).')
+    parser.add_argument("--log-mode", required=False, default="full", choices=["full", "fast"], metavar="\b", help='"full" (default) logs every corrupted file, "fast" uses background log sinks and reports the corrupted files of a directory once as a count.')
+    parser.add_argument("--cluster", required=False, default="", metavar="\b", help='Serve the chunks of input files on this "HOST:PORT" to the worker nodes started with --worker, instead of a local process pool (the input and output paths must be shared by every host).')
+    parser.add_argument("--worker", required=False, default="", metavar="\b", help='Run as a worker node of the coordinator listening on this "HOST:PORT", with -c (--cores) worker processes (stop with Ctrl+C).')
+    parser.add_argument("--authkey", required=False, default=os.environ.get("RECTANGLE_AUTHKEY", ""), metavar="\b", help='The shared secret of the coordinator and its worker nodes (default: the RECTANGLE_AUTHKEY environment variable, required unless the address is a loopback one, e.g. 127.0.0.1).')
+    parser.add_argument("-q", "--quarantine", required=False, default="", metavar="\b", help="Collect every corrupted input (path, field, raw value, reason) into this JSON Lines file and display their counts, instead of logging one error per file.")
+    parser.add_argument("--serve", required=False, default="", metavar="\b", help='Keep a warm process answering JSON rectangle requests (one per line) on this Unix socket path or "HOST:PORT" (stop with Ctrl+C).')
+    parser.add_argument("-s", "--chunk-size", required=False, default=0, type=int, metavar="\b", help="The number of JSON files sent to a CPU core at once (default: 0, automatically computed from the number of files and cores).")
+
+    return parser.parse_args()
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------ Define the -l/-w fast path function -----------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def __run_fast_path(argv): # Internal use only, cannot call out when the module is being imported
+    '''
+    Compute a rectangle given only by -l (--length) and -w (--width), without argparse, loguru, NumPy or multiprocessing,
+    and print its result to stdout.
+    Return False (nothing is printed) if the call needs the full program: other options, missing or invalid inputs.
+    '''
+    options = {}
+    arguments = iter(argv)
+
+    for argument in arguments:
+        name, has_value, value = argument.partition("=") # Both "--length 2" and "--length=2"
+        
+        if name not in ("-l", "--length", "-w", "--width"):
+            return False
+        
+        options[name.lstrip("-")[0]] = value if has_value else next(arguments, None)
+    
+    if set(options) != {"l", "w"}:
+        return False
+    
+    calculator = RectangleCalculator(length=options["l"], width=options["w"])
+    calculator.length, calculator.width = RectangleCalculator._RectangleCalculator__valiate_input_number(calculator.length, calculator.width)
+
+    if None in [calculator.length, calculator.width]:
+        return False # The full program reports the invalid inputs
+    
+    print(calculator.summary().strip("\n")) # No log prefix to separate from
+    return True
+
+
+#------------------------------------------------------------------------------------------------------------#
+#------------------------------------------ Define main() function ------------------------------------------#
+#------------------------------------------------------------------------------------------------------------#
+
+def main():
+    try:
+        # calculator = RectangleCalculator(
+        #     length = '2',
+        #     width = "3.5"
+        # )
+        # calculator._input = "02_Python_class_OOP/rectangle_project/data"
+        # calculator._output = ""
+        # calculator._cores = 2
+
+        args = __parse_args()
+
+        if args.worker != "":
+            worker_address = __parse_address(args.worker)
+            if (authkey := __cluster_authkey(worker_address, args.authkey)) is not None:
+                __run_cluster_worker_node(worker_address, authkey, __usable_cores() if args.cores == "auto" else args.cores)
+            return None
+        
+        if (args.cluster != "") and ((cluster_authkey := __cluster_authkey(__parse_address(args.cluster), args.authkey)) is None):
+            return None
+        
+        if args.serve != "":
+            RectangleServer(args.serve).serve_forever()
+            return None
+
+        calculator = RectangleCalculator(
+            length = args.length,
+            width = args.width
+        )
+        calculator._input = args.input
+        calculator._output = args.output
+        calculator._auto_execution = (args.cores == "auto")
+        calculator._cores = __usable_cores() if calculator._auto_execution else args.cores # Planned again by __plan_execution() before dispatching
+        calculator._chunk_size = args.chunk_size
+        calculator._output_format = args.output_format
+        calculator._incremental = args.incremental
+        calculator._resume = args.resume
+        calculator._watch = args.watch
+        calculator._poll_interval = args.poll_interval
+        calculator._async_io = args.async_io
+        calculator._io_concurrency = args.io_concurrency
+        calculator._metrics = RectangleMetrics(enabled=(args.metrics != ""))
+        calculator._log_mode = args.log_mode
+        calculator._quarantine_path = args.quarantine
+        calculator._cluster_address = args.cluster
+        if calculator._cluster_address != "":
+            calculator._cluster_authkey = cluster_authkey
+
+        if calculator._log_mode == "fast":
+            __config_fast_logging()
+
+        if calculator._watch and ((calculator._input == "") or (not Path(calculator._input).is_dir())):
+            logger.warning("The watch mode only works with an input directory (-i, --input), it is ignored\n")
+
+        if (calculator._input != "") and (Path(calculator._input).is_dir()):
+            calculator._input = Path(calculator._input)
+            
+            input_json_files = [entry.name for entry in calculator._input.glob("*.json")]
+            calculator._json_count = len(input_json_files)
+
+            if calculator._watch:
+                __config_log_file(calculator._input.parent, enqueue=(calculator._log_mode == "fast"))
+                __run_watch_mode(calculator)
+            
+            elif (calculator._json_count > 1) and (calculator._output_format != "json") and (str(calculator._output) != ""):
+                __config_log_file(calculator._input.parent, enqueue=(calculator._log_mode == "fast"))
+                if calculator._incremental:
+                    logger.warning('The incremental mode only works with the "json" output format (one file per rectangle), all input files are computed again\n')
+                
+                if calculator._resume:
+                    logger.warning('The resume mode only works with the "json" output format (one file per rectangle), all input files are computed again\n')
+                
+                results_file = calculator._RectangleCalculator__validate_results_file()
+
+                with RectangleResultWriter(results_file, calculator._output_format) as writer:
+                    __dispatch_chunks(calculator, input_json_files, writer)
+                
+                results_file = colored(str(results_file), (139, 0, 0), attrs=["bold"])
+                logger.info(f"All results are saved in {results_file}\n")
+
+            elif calculator._json_count > 1:
+                calculator._output = calculator._RectangleCalculator__validate_output_directory()
+
+                match str(calculator._output):
+                    case "":
+                        logger.warning(
+                            (   
+                                "\nYou are passing multiple input files but no valid ouput directory path was given!!!"
+                                "\nIf you procced, all results will be displayed here WITHOUT being saved!!!"
+                            )
+                        )
+                        
+                        answer = input(colored("Would you like to proceed? [y/n]: ", "blue", attrs=["bold"]))
+
+                        if answer.lower() == "y":
+                            __dispatch_chunks(calculator, input_json_files)
+                        
+                        else:
+                            return None # stop the program
+                        
+                    case _:
+                        __config_log_file(calculator._input.parent, enqueue=(calculator._log_mode == "fast")) # Only produce rectangle_logs.txt if the input and output directories or files are given           
+                        
+                        if calculator._incremental and calculator._resume:
+                            logger.warning("The resume mode is ignored in the incremental mode, which already skips the unchanged input files\n")
                         
-                        with multiprocessing.Pool(processes=calculator._cores) as pool:
-                                pool.starmap(func=calculator._single_workflow, iterable=input_json_files)
+                        if calculator._incremental:
+                            changed_json_files, manifest = calculator._RectangleCalculator__plan_incremental_run(input_json_files)
+                            
+                            if changed_json_files:
+                                __dispatch_chunks(calculator, changed_json_files)
+                            
+                            else:
+                                logger.info("All input JSON files are unchanged since the previous run, nothing to compute\n")
+                            
+                            calculator._RectangleCalculator__save_manifest(manifest)
+                        
+                        else:
+                            progress_file = calculator._output.joinpath(RectangleCalculator._progress_name)
+
+                            with RectangleProgressLog(progress_file, resume=calculator._resume) as progress_log:
+                                pending_json_files = input_json_files
+
+                                if calculator._resume:
+                                    pending_json_files = [name for name in input_json_files if name not in progress_log.completed_files]
+                                    logger.info(f"Resume mode: {calculator._json_count - len(pending_json_files)} input JSON files are already done, {len(pending_json_files)} files remaining\n")
+                                
+                                if pending_json_files:
+                                    __dispatch_chunks(calculator, pending_json_files, progress_log=progress_log)
                         
                         # for entry in calculator._input.glob("*.json"):
                         #     calculator._single_workflow(entry.name)
@@ -405,7 +2459,7 @@ def main():
             
             elif calculator._json_count == 1:
                 logger.debug("Only one input JSON file is detected in the given directory. If the output path is also given, it should be in a file format.\n")
-                calculator._input = calculator._input.joinpath(input_json_files[0][0])
+                calculator._input = calculator._input.joinpath(input_json_files[0])
                 calculator._single_workflow(calculator._input)
                 calculator._display_saving_single_output_message()
             
@@ -420,6 +2474,12 @@ def main():
             if Path(calculator._input).suffix == ".json":
                 calculator._single_workflow(calculator._input)         
 
+            elif Path(calculator._input).suffix in RectangleCalculator._bulk_suffixes:
+                if str(calculator._output) != "":
+                    __config_log_file(calculator._input.parent, enqueue=(calculator._log_mode == "fast"))
+                
+                calculator._bulk_workflow()
+
             else:
                 logger.warning("The given input path is not a JSON file! Use inputs from -l (--length) and -w (--width) for calculation")
                 calculator._single_workflow('')       
@@ -433,6 +2493,14 @@ def main():
             calculator._single_workflow('')
             calculator._display_saving_single_output_message()
 
+        if calculator._quarantine_path != "":
+            calculator._RectangleCalculator__save_quarantine()
+
+        if args.metrics != "":
+            calculator._metrics.save(args.metrics)
+            metrics_file = colored(str(args.metrics), (139, 0, 0), attrs=["bold"])
+            logger.info(f"The metrics summary is saved in {metrics_file}\n")
+
     
     except Exception as e:
         logger.critical(f"{e}\n")
@@ -443,5 +2511,7 @@ def main():
 #---------------------------------------------------------------------------------------------------------#
 
 if __name__ == "__main__":
-    main()
-    logger.info("Program ended! Thank you!\n")
+    if not __run_fast_path(sys.argv[1:]): # python rectangle_module.py -l 2 -w 3 skips everything below
+        main()
+        logger.info("Program ended! Thank you!\n")
+        logger.complete() # Wait until the background log sinks (--log-mode fast) have written every message
@@ -166,4 +166,119 @@ print(df_testing_cases)
 # │ both_invalid ┆ not_existed   ┆ existed_dir     │   python rectangle_module.py -l a -w b -i ./abcxyz -o ./data_single
 # │ both_invalid ┆ not_existed   ┆ json_file       │   python rectangle_module.py -l a -w b -i ./abcxyz -o ./result_test.json
 # │ both_invalid ┆ not_existed   ┆ not_json_file   │   python rectangle_module.py -l a -w b -i ./abcxyz -o ./result_test.txt
-# └──────────────┴───────────────┴─────────────────┘
\ No newline at end of file
+# └──────────────┴───────────────┴─────────────────┘
+
+# Bulk input files (one rectangle per line, streamed in batches instead of opening one JSON file per rectangle)
+# --input: bulk_jsonl, bulk_csv
+#
+#   python rectangle_module.py -i ./rectangles.jsonl                          # results are NOT saved, only the counts are displayed
+#   python rectangle_module.py -i ./rectangles.jsonl -o ./result_test          # saved in ./result_test/rectangles_results.jsonl
+#   python rectangle_module.py -i ./rectangles.csv -o ./result_test.jsonl      # saved in ./result_test.jsonl
+#   python rectangle_module.py -i ./rectangles.csv -o ./result_test.txt        # automatically set as ./result_test.jsonl
+
+
+# One-file output formats (all results appended to a single file by the parent process, instead of one JSON file per rectangle)
+# --output-format: json (default, one file per rectangle), jsonl, csv, parquet, arrow
+#
+#   python rectangle_module.py -i ./data -o ./result_test -f csv              # saved in ./result_test/data_results.csv
+#   python rectangle_module.py -i ./data -o ./result_test.parquet -f parquet  # saved in ./result_test.parquet (requires pyarrow)
+#   python rectangle_module.py -i ./data -o ./result_test.txt -f arrow        # automatically set as ./result_test.arrow (requires pyarrow)
+#   python rectangle_module.py -i ./rectangles.jsonl -o ./result_test -f csv  # saved in ./result_test/rectangles_results.csv
+
+
+# Incremental runs (the output directory is kept, only new or changed input JSON files are computed again)
+# --incremental: a manifest (.rectangle_manifest.json) of the input files is stored in the output directory
+#
+#   python rectangle_module.py -i ./data -o ./result_test --incremental       # 1st run: every input file is computed
+#   python rectangle_module.py -i ./data -o ./result_test --incremental       # 2nd run: nothing to compute
+#   python rectangle_module.py -i ./data -o ./result_test -f csv --incremental # warning: only works with the "json" output format
+
+
+# Watch mode (keep running with a warm process pool, compute every new or changed JSON file dropped into the input directory)
+# --watch, --poll-interval: stop with Ctrl+C
+#
+#   python rectangle_module.py -i ./data -o ./result_test --watch                       # one result JSON file per new input file
+#   python rectangle_module.py -i ./data -o ./result_test -f csv --watch                # results appended to ./result_test/data_results.csv
+#   python rectangle_module.py -i ./data -o ./result_test --watch --incremental         # skip the files unchanged since the previous run
+#   python rectangle_module.py -i ./data --watch                                        # critical: an output path is needed
+
+
+# Asyncio pipeline (one process: bounded concurrent reads -> vectorized compute -> bounded writer queue)
+# --async-io, --io-concurrency
+#
+#   python rectangle_module.py -i ./data -o ./result_test --async-io                          # same result files as the process pool
+#   python rectangle_module.py -i ./data -o ./result_test -f csv --async-io --io-concurrency 8 # saved in ./result_test/data_results.csv
+
+
+# Per-stage timing instrumentation (load, validate, compute, log, write), merged from every worker process
+# --metrics: JSON summary, or Prometheus text format if the file ends with ".prom"
+#
+#   python rectangle_module.py -i ./data -o ./result_test -m ./metrics.json
+#   python rectangle_module.py -i ./data -o ./result_test -f csv -m ./metrics.prom
+
+
+# Non-blocking logging (log sinks written by a background thread, corrupted input files reported once as a count)
+# --log-mode: "full" (default) or "fast"
+#
+#   python rectangle_module.py -i ./data -o ./result_test --log-mode fast              # "20 CORRUPTED input files were detected (...)"
+#   python rectangle_module.py -i ./data -o ./result_test --log-mode fast --async-io
+
+
+# Checkpoint and resume (the input JSON files already done are appended to ./result_test/.rectangle_progress.log)
+# --resume: keep the output directory, skip the files recorded by the interrupted run
+#
+#   python rectangle_module.py -i ./data -o ./result_test            # killed in the middle (Ctrl+C, kill -9, preempted machine...)
+#   python rectangle_module.py -i ./data -o ./result_test --resume   # "Resume mode: N input JSON files are already done, M files remaining"
+#   python rectangle_module.py -i ./data -o ./result_test -f csv --resume # warning: only works with the "json" output format
+
+
+# Multi-node work queue (chunks of input files served over TCP to worker nodes, counts and results streamed back)
+# --cluster HOST:PORT on the coordinator, --worker HOST:PORT on every worker node, same --authkey (or RECTANGLE_AUTHKEY) everywhere
+# A non-loopback address refuses to start without a secret --authkey (or RECTANGLE_AUTHKEY), the default key is only allowed on 127.0.0.1
+# The input and output paths must be the same on every host (e.g. a shared NFS mount). Testable on one machine with localhost workers:
+#
+#   python rectangle_module.py --worker 127.0.0.1:50000 -c 4                              # terminal 1 (and 2, 3... for more nodes)
+#   python rectangle_module.py -i ./data -o ./result_test --cluster 127.0.0.1:50000        # terminal 0, the coordinator
+#   python rectangle_module.py -i ./data -o ./result_test -f csv --cluster 127.0.0.1:50000 # results streamed back, written by the coordinator
+#   kill -9 a worker node in the middle of a run: its chunk is handed out again once its lease ends (RectangleClusterExecutor._lease_seconds)
+
+
+# Fast startup (heavy modules are imported on first use only, a pure -l/-w call skips argparse and loguru)
+# The fast path prints the result to stdout, any other option (or an invalid input) runs the full program
+#
+#   python rectangle_module.py -l 2 -w 3                                   # fast path
+#   python rectangle_module.py -l 2 -w abc                                 # full program: "NO valid inputs were detected..."
+#   python -X importtime rectangle_module.py -l 2 -w 3                      # import time of every module
+#   python benchmark_rectangle_module.py --startup-only --startup-repeats 50 # cold start report in bench_report.json
+
+
+# Request server (a warm process, one JSON request per line, one JSON response per line in the same order)
+# --serve: a Unix socket path or HOST:PORT, stop with Ctrl+C
+#
+#   python rectangle_module.py --serve /tmp/rectangle.sock
+#   python rectangle_module.py --serve 127.0.0.1:8765
+#
+#   echo '{"length": 2, "width": 3}' | socat - UNIX-CONNECT:/tmp/rectangle.sock           # {"length": 2.0, "width": 3.0, "perimeter": 10.0, "area": 6.0}
+#   echo '{"id": 7, "length": "abc", "width": 3}' | socat - UNIX-CONNECT:/tmp/rectangle.sock # {"id": 7, ..., "error": "CORRUPTED inputs! ..."}
+#   echo '[{"length": 1, "width": 1}, {"length": 4, "width": 5}]' | nc 127.0.0.1 8765      # a list of rectangles gets a list of results
+
+
+# Adaptive execution (a sample of the input files is read to measure the cost of one file)
+# --cores auto: chooses serial, thread (asyncio pipeline) or process execution, the number of workers and the chunk size,
+#               from the number of files and the cores usable by this process (os.sched_getaffinity), then logs the decision
+#
+#   python rectangle_module.py -i ./data -o ./result_test -c auto              # "Auto execution: serial ... cheaper than starting a process pool"
+#   python rectangle_module.py -i ./big_data -o ./result_test -c auto -f csv   # "Auto execution: process with N worker(s) and chunks of up to M files ..."
+#   taskset -c 0 python rectangle_module.py -i ./big_data -o ./result_test -c auto # "... only one core is usable by this process"
+#   python rectangle_module.py -i ./data -o ./result_test -c auto --async-io   # "Auto execution: thread ... because --async-io was given"
+
+
+# Quarantine report (corrupted inputs are collected by the workers and written once by the parent process)
+# -q / --quarantine: a JSON Lines file, one {"path", "field", "raw", "reason"} object per corrupted field ("line" is added for bulk inputs)
+# The console only gets the counts per reason, not one error per corrupted file
+#
+#   python rectangle_module.py -i ./data -o ./result_test -q ./quarantine.jsonl
+#   # WARNING - 19 CORRUPTED inputs (25 fields) are quarantined in ./quarantine.jsonl (not a number: 13, not a finite number: 6, ...)
+#   python rectangle_module.py -i ./rectangles.jsonl -o ./results.jsonl -q ./quarantine.jsonl   # {"path": ..., "field": "length", "raw": "abc", "reason": "not a number", "line": 42}
+#   # an unreadable line has "field": "line" and "reason": "invalid JSON" (or 'not a {"length", "width"} object' for e.g. [3, 4])
+#   python rectangle_module.py -i ./data -o ./result_test -q ./quarantine.jsonl --watch          # saved once, when the watch is stopped